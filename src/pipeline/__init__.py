@@ -48,6 +48,8 @@ from .models import (
     LabResult,
     ClaimLine,
     Claim,
+    compute_abnormal_bulk,
+    validate_npi_bulk,
 )
 
 # PII
@@ -129,6 +131,8 @@ __all__ = [
     "LabResult",
     "ClaimLine",
     "Claim",
+    "compute_abnormal_bulk",
+    "validate_npi_bulk",
     # PII
     "PIIType",
     "PIIPattern",
@@ -0,0 +1,15 @@
+"""
+BLAKE3 Support
+
+The optional ``blake3`` module, shared by the audit log and file hashing.
+It is None unless the ``fast`` extra is installed.
+"""
+
+from __future__ import annotations
+
+try:
+    import blake3  # type: ignore[import-not-found, unused-ignore]
+except ImportError:  # optional speedup: pip install regulated-data-pipelines[fast]
+    blake3 = None  # type: ignore[assignment, unused-ignore]
+
+__all__ = ["blake3"]
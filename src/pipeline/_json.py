@@ -0,0 +1,28 @@
+"""
+JSON Helpers
+
+Parsing shared by the audit log and lineage store, using orjson when the
+optional ``fast`` extra is installed.
+"""
+
+from __future__ import annotations
+
+import json
+from typing import Any
+
+try:
+    import orjson
+except ImportError:  # optional speedup: pip install regulated-data-pipelines[fast]
+    orjson = None  # type: ignore[assignment]
+
+__all__ = ["loads"]
+
+
+def loads(data: bytes | str) -> Any:
+    """Parse a JSON document, with orjson when it is installed."""
+    if orjson is not None:
+        try:
+            return orjson.loads(data)
+        except orjson.JSONDecodeError:
+            pass  # NaN/Infinity and >64-bit ints are only accepted by json
+    return json.loads(data)
@@ -0,0 +1,35 @@
+"""
+Luhn Checksums
+
+Table-driven Luhn digit sums shared by the credit card detector and the
+NPI validators.
+"""
+
+from __future__ import annotations
+
+__all__ = ["luhn_sum"]
+
+
+# ASCII digit -> digit value, and -> digit sum of twice its value
+_DIGIT_VALUES = bytes.maketrans(b"0123456789", bytes(range(10)))
+_DOUBLED_VALUES = bytes.maketrans(b"0123456789", bytes((0, 2, 4, 6, 8, 1, 3, 5, 7, 9)))
+
+
+def luhn_sum(digits: str, double_last: bool = False) -> int:
+    """
+    Return the Luhn digit sum of an all-digit string.
+
+    Every second digit from the right is doubled, starting with the
+    second-to-last digit, or with the last one when ``double_last`` is set.
+    Each half is mapped through a lookup table and summed in C, so no
+    per-digit ``int()`` calls or branches run in Python.
+    """
+    if not digits.isascii():
+        # Non-ASCII Unicode digits (str.isdigit accepts them)
+        digits = "".join(str(int(d)) for d in digits)
+    data = digits.encode("ascii")
+    if double_last:
+        doubled, plain = data[-1::-2], data[-2::-2]
+    else:
+        doubled, plain = data[-2::-2], data[-1::-2]
+    return sum(plain.translate(_DIGIT_VALUES)) + sum(doubled.translate(_DOUBLED_VALUES))
@@ -7,16 +7,31 @@ Supports integrity verification, retention policies, and export formats.
 
 from __future__ import annotations
 
+import atexit
+import dataclasses
 import hashlib
+import itertools
 import json
-import uuid
+import os
+import queue
+import re
+import secrets
+import threading
+import weakref
+from collections import Counter
+from contextlib import contextmanager
 from datetime import datetime, timezone
 from enum import Enum
+from functools import partial
 from pathlib import Path
-from typing import Any
+from typing import Any, BinaryIO, Callable, Iterable, Iterator
 
 from pydantic import BaseModel, Field
 
+from ._blake3 import blake3
+from ._ids import uuid4_str
+from ._json import loads as _loads
+
 
 # =============================================================================
 # AUDIT ENUMS
@@ -64,11 +79,53 @@ class AuditLevel(str, Enum):
     CRITICAL = "critical"
 
 
+# Lifecycle status reported by AuditEntry.status
+_ACTION_STATUS: dict[AuditAction, str] = {
+    AuditAction.PIPELINE_START: "started",
+    AuditAction.PIPELINE_COMPLETE: "completed",
+    AuditAction.PIPELINE_FAILED: "failed",
+}
+
+
 # =============================================================================
 # AUDIT ENTRY
 # =============================================================================
 
 
+def _json_default(obj: Any) -> Any:
+    """Render non-JSON values as ``model_dump()`` + ``default=str`` would."""
+    if isinstance(obj, BaseModel):
+        return obj.model_dump()
+    if dataclasses.is_dataclass(obj) and not isinstance(obj, type):
+        return dataclasses.asdict(obj)
+    return str(obj)
+
+
+# Chain hash functions by name. SHA-256 hashes are stored as bare hex (the
+# original format); other algorithms prefix the digest with "<name>:".
+_HASHERS: dict[str, Callable[[bytes], Any]] = {
+    "sha256": hashlib.sha256,
+    "blake2b": lambda data: hashlib.blake2b(data, digest_size=32),
+}
+if blake3 is not None:
+    _HASHERS["blake3"] = blake3.blake3
+
+
+def _digest(data: bytes, hash_algo: str = "sha256") -> str:
+    """Hash canonical entry bytes, tagging non-SHA-256 digests."""
+    hasher = _HASHERS.get(hash_algo)
+    if hasher is None:
+        raise ValueError(f"Unsupported hash algorithm: {hash_algo!r}")
+    digest = hasher(data).hexdigest()
+    return digest if hash_algo == "sha256" else f"{hash_algo}:{digest}"
+
+
+def _hash_algo_of(entry_hash: str) -> str:
+    """Return the algorithm an entry hash was produced with."""
+    algo, sep, _ = entry_hash.partition(":")
+    return algo if sep else "sha256"
+
+
 class AuditEntry(BaseModel):
     """
     Immutable audit log entry with integrity verification.
@@ -77,7 +134,7 @@ class AuditEntry(BaseModel):
     """
     
     # Identity
-    entry_id: str = Field(default_factory=lambda: str(uuid.uuid4()))
+    entry_id: str = Field(default_factory=uuid4_str)
     
     # Timestamp (always UTC)
     timestamp: datetime = Field(
@@ -115,23 +172,89 @@ class AuditEntry(BaseModel):
     previous_hash: str = ""
     entry_hash: str = ""
     
-    def compute_hash(self) -> str:
-        """Compute SHA-256 hash of entry contents."""
+    def _canonical_json(self) -> bytes:
+        """Serialize entry contents (minus entry_hash) in canonical hash form."""
+        # Field values are read directly rather than via model_dump(); the
+        # default hook keeps nested models/dataclasses hashing as before.
+        data = self.__dict__.copy()
         # Exclude entry_hash itself from the hash computation
-        data = self.model_dump(exclude={"entry_hash"})
-        json_str = json.dumps(data, sort_keys=True, default=str)
-        return hashlib.sha256(json_str.encode()).hexdigest()
+        del data["entry_hash"]
+        # Same text str() gives, without a trip through the default hook
+        data["timestamp"] = self.timestamp.isoformat(" ")
+        return json.dumps(data, sort_keys=True, default=_json_default).encode()
     
-    def with_hash(self, previous_hash: str = "") -> "AuditEntry":
-        """Return a new entry with computed hash chain."""
+    def compute_hash(self, hash_algo: str | None = None) -> str:
+        """
+        Compute the hash of entry contents.
+        
+        Defaults to the algorithm of the stored entry_hash (SHA-256 if unset).
+        """
+        if hash_algo is None:
+            hash_algo = _hash_algo_of(self.entry_hash)
+        return _digest(self._canonical_json(), hash_algo)
+    
+    def _chain(self, previous_hash: str = "", hash_algo: str = "sha256") -> bytes:
+        """
+        Link the entry to ``previous_hash`` and return its JSONL line.
+        
+        The line is the canonical form with entry_hash appended, so the
+        contents are serialized once and disk matches exactly what was hashed.
+        """
         self.previous_hash = previous_hash
-        self.entry_hash = self.compute_hash()
+        canonical = self._canonical_json()
+        self.entry_hash = _digest(canonical, hash_algo)
+        # Splice the hash in before the closing brace without copying the body
+        return b"".join((
+            memoryview(canonical)[:-1],
+            b', "entry_hash": "',
+            self.entry_hash.encode(),
+            b'"}\n',
+        ))
+    
+    def with_hash(
+        self, previous_hash: str = "", hash_algo: str = "sha256"
+    ) -> "AuditEntry":
+        """Return a new entry with computed hash chain."""
+        self._chain(previous_hash, hash_algo)
         return self
     
     def verify_integrity(self) -> bool:
         """Verify that entry hash matches contents."""
+        if _hash_algo_of(self.entry_hash) not in _HASHERS:
+            return False
         expected = self.compute_hash()
         return self.entry_hash == expected
+    
+    @property
+    def status(self) -> str:
+        """Lifecycle status implied by the action ("" for other actions)."""
+        return _ACTION_STATUS.get(self.action, "")
+
+
+# Trailer appended by AuditEntry._chain(); everything before it is the
+# canonical form that was hashed.
+_ENTRY_HASH_TRAILER = re.compile(
+    rb', "entry_hash": "(?:[0-9a-z]+:)?[0-9a-f]*"\}$'
+)
+
+
+def _rehash_line(line: bytes) -> tuple[dict[str, Any], str | None]:
+    """
+    Parse a raw JSONL line and recompute its entry hash.
+    
+    Lines written by AuditLogger are hashed straight from their bytes;
+    lines in any other layout are re-serialized through AuditEntry.
+    The hash is None when entry_hash names an unknown algorithm.
+    """
+    data = _loads(line)
+    hash_algo = _hash_algo_of(data.get("entry_hash", ""))
+    if hash_algo not in _HASHERS:
+        return data, None
+    trailer = _ENTRY_HASH_TRAILER.search(line)
+    if trailer is not None:
+        canonical = line[:trailer.start()] + b"}"
+        return data, _digest(canonical, hash_algo)
+    return data, AuditEntry.model_validate(data).compute_hash()
 
 
 # =============================================================================
@@ -139,6 +262,11 @@ class AuditEntry(BaseModel):
 # =============================================================================
 
 
+# Background writer queue items: encoded lines with their entry count, a
+# flush barrier, or None to stop
+_WriterItem = tuple[bytes, int] | threading.Event | None
+
+
 class AuditLogger:
     """
     Production-grade audit logger with:
@@ -146,88 +274,334 @@ class AuditLogger:
     - Hash chain for integrity
     - Automatic rotation support
     - Multiple output formats
+    
+    The log file is held open in append mode for the lifetime of the
+    logger; call ``close()`` (or use it as a context manager) to release it.
+    Set ``fsync_every`` to force entries to stable storage every N writes,
+    and wrap bursts of log calls in ``batch()`` to coalesce their writes.
+    With ``async_writer=True`` entries are still chained by the caller but
+    written by a background thread; ``flush()`` waits for it to catch up.
+    A failed background write is raised by every later call until
+    ``close()``, which resumes the chain from the last entry on disk.
+    ``hash_algo`` selects the chain hash ("sha256", "blake2b", or "blake3"
+    when installed); each entry records its algorithm so logs can mix them.
     """
     
+    _TAIL_BLOCK_SIZE = 1 << 16
+    
     def __init__(
         self,
         audit_path: str | Path,
         pipeline_id: str | None = None,
         pipeline_name: str = "",
         user_id: str = "system",
+        fsync_every: int = 0,
+        async_writer: bool = False,
+        hash_algo: str = "sha256",
     ):
+        if hash_algo not in _HASHERS:
+            raise ValueError(
+                f"Unsupported hash algorithm: {hash_algo!r} "
+                f"(available: {', '.join(_HASHERS)})"
+            )
+
         self.audit_path = Path(audit_path)
         self.audit_path.parent.mkdir(parents=True, exist_ok=True)
         
-        self.pipeline_id = pipeline_id or str(uuid.uuid4())[:8]
+        self.pipeline_id = pipeline_id or secrets.token_hex(4)
         self.pipeline_name = pipeline_name
         self.user_id = user_id
+        self.fsync_every = fsync_every
+        self.async_writer = async_writer
+        self.hash_algo = hash_algo
         
         self._last_hash = ""
         self._entry_count = 0
         
+        # Running summary counters so get_summary() needn't rescan the file.
+        # Entries already on disk are only counted on first use.
+        self._actions: Counter[AuditAction] = Counter()
+        self._levels: Counter[AuditLevel] = Counter()
+        self._first_timestamp: datetime | None = None
+        self._last_timestamp: datetime | None = None
+        self._counters_loaded = True
+        
+        # Append handle and write serialization
+        self._fh: BinaryIO | None = None
+        self._lock = threading.RLock()
+        self._unsynced = 0
+        self._batch_depth = 0
+        
+        # Background writer (async_writer=True), started on first write
+        self._queue: queue.SimpleQueue[_WriterItem] | None = None
+        self._writer: threading.Thread | None = None
+        self._writer_error: Exception | None = None
+        self._close_at_exit: Callable[[], None] | None = None
+        
         # Load last hash if file exists
         if self.audit_path.exists():
             self._load_last_hash()
     
+    def __enter__(self) -> "AuditLogger":
+        return self
+    
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+    
+    def __del__(self) -> None:
+        try:
+            self.close()
+        except Exception:
+            pass
+    
+    def close(self) -> None:
+        """Drain pending writes, then flush and release the file handle."""
+        with self._lock:
+            if self._queue is not None and self._writer is not None:
+                self._queue.put(None)
+                if self._writer is not threading.current_thread():
+                    self._writer.join()
+                self._queue = None
+                self._writer = None
+            if self._close_at_exit is not None:
+                atexit.unregister(self._close_at_exit)
+                self._close_at_exit = None
+            
+            if self._fh is not None:
+                self._fh.flush()
+                if self._unsynced:
+                    os.fsync(self._fh.fileno())
+                    self._unsynced = 0
+                self._fh.close()
+                self._fh = None
+            
+            error, self._writer_error = self._writer_error, None
+            if error is not None:
+                # Entries after the failed write never reached the file:
+                # chain later ones from what is actually there
+                self._last_hash = ""
+                self._load_last_hash()
+                self._counters_loaded = False
+        
+        if error is not None:
+            raise error
+    
+    def flush(self) -> None:
+        """Push pending entries to the OS (and fsync if one is due)."""
+        with self._lock:
+            if self._queue is not None:
+                # Wait for the background writer to drain what is queued
+                done = threading.Event()
+                self._queue.put(done)
+                done.wait()
+                self._raise_writer_error()
+            else:
+                self._sync()
+    
+    @contextmanager
+    def batch(self) -> Iterator["AuditLogger"]:
+        """
+        Coalesce the writes of a burst of log calls.
+        
+        Entries are chained as usual but stay in the write buffer until it
+        fills or the block exits, instead of being flushed one by one.
+        """
+        with self._lock:
+            self._batch_depth += 1
+        try:
+            yield self
+        finally:
+            with self._lock:
+                self._batch_depth -= 1
+                if self._batch_depth == 0:
+                    self.flush()
+    
+    def _write(self, data: bytes, count: int = 1) -> None:
+        """
+        Append encoded lines to the log. Caller must hold ``self._lock``.
+        
+        Outside of ``batch()`` data is flushed to the OS on every call so
+        readers see it immediately; fsync happens every ``fsync_every`` entries.
+        With ``async_writer`` the lines are handed to the writer thread instead.
+        """
+        if self.async_writer:
+            pending = self._queue if self._queue is not None else self._start_writer()
+            self._raise_writer_error()
+            pending.put((data, count))
+            return
+        
+        self._append(data, count)
+        if not self._batch_depth:
+            self._sync()
+    
+    def _append(self, data: bytes, count: int) -> None:
+        """Write lines to the append handle, opening it on first use."""
+        if self._fh is None:
+            self._fh = open(self.audit_path, "ab", buffering=1 << 16)
+        self._fh.write(data)
+        if self.fsync_every > 0:
+            self._unsynced += count
+    
+    def _sync(self) -> None:
+        """Flush the append handle, fsyncing every ``fsync_every`` entries."""
+        if self._fh is None:
+            return
+        self._fh.flush()
+        if self.fsync_every > 0 and self._unsynced >= self.fsync_every:
+            os.fsync(self._fh.fileno())
+            self._unsynced = 0
+    
+    def _start_writer(self) -> queue.SimpleQueue[_WriterItem]:
+        """Start the background writer thread and return its queue."""
+        pending: queue.SimpleQueue[_WriterItem] = queue.SimpleQueue()
+        self._queue = pending
+        # The thread and the exit hook hold the logger weakly, so one that
+        # is dropped without close() is still collected (and closed)
+        ref = weakref.ref(self)
+        self._writer = threading.Thread(
+            target=self._writer_loop,
+            args=(ref, pending),
+            name=f"audit-writer-{self.pipeline_id}",
+            daemon=True,
+        )
+        self._writer.start()
+        # Drain at interpreter exit if the logger is never closed
+        self._close_at_exit = partial(self._close_ref, ref)
+        atexit.register(self._close_at_exit)
+        return pending
+    
+    @staticmethod
+    def _close_ref(ref: weakref.ref[AuditLogger]) -> None:
+        """Close the referenced logger if it is still alive."""
+        logger = ref()
+        if logger is not None:
+            logger.close()
+    
+    @staticmethod
+    def _writer_loop(
+        ref: weakref.ref[AuditLogger], pending: queue.SimpleQueue[_WriterItem]
+    ) -> None:
+        """Drain queued lines into the file, one flush per drained batch."""
+        while True:
+            items = [pending.get()]
+            while not pending.empty():
+                items.append(pending.get_nowait())
+            
+            stop = None in items
+            logger = ref()
+            # After a failed write nothing more is appended: later entries
+            # chain from one that is not in the file
+            if logger is not None and logger._writer_error is None:
+                try:
+                    for item in items:
+                        if isinstance(item, tuple):
+                            logger._append(*item)
+                    logger._sync()
+                except Exception as e:
+                    logger._writer_error = e
+            del logger
+            
+            for item in items:
+                if isinstance(item, threading.Event):
+                    item.set()
+            if stop:
+                return
+    
+    def _raise_writer_error(self) -> None:
+        """Re-raise a background writer failure in the calling thread."""
+        if self._writer_error is not None:
+            raise self._writer_error
+    
     def _load_last_hash(self) -> None:
         """Load the hash of the last entry for chain continuity."""
         try:
             with open(self.audit_path, "rb") as f:
-                # Seek to find last line
-                f.seek(0, 2)  # End of file
-                size = f.tell()
-                if size == 0:
-                    return
+                size = f.seek(0, os.SEEK_END)
                 
-                # Read backwards to find last newline
-                pos = size - 1
-                while pos > 0:
-                    f.seek(pos)
-                    if f.read(1) == b"\n":
+                # Read a block off the end, widening it until it holds a
+                # complete last line
+                block = self._TAIL_BLOCK_SIZE
+                while True:
+                    start = max(0, size - block)
+                    f.seek(start)
+                    tail = f.read().rstrip()
+                    newline = tail.rfind(b"\n")
+                    if newline != -1 or start == 0:
                         break
-                    pos -= 1
-                
-                # Read last line
-                if pos > 0:
-                    f.seek(pos + 1)
-                else:
-                    f.seek(0)
+                    block *= 2
                 
-                last_line = f.readline().decode("utf-8").strip()
+                last_line = tail[newline + 1:]
                 if last_line:
                     entry = AuditEntry.model_validate_json(last_line)
                     self._last_hash = entry.entry_hash
-                    self._entry_count += 1
+                    self._counters_loaded = False
         except Exception:
             pass
     
-    def log(self, entry: AuditEntry) -> AuditEntry:
-        """
-        Append an audit entry to the log.
-        
-        Automatically adds hash chain and writes to file.
-        """
-        # Set defaults from logger config
+    def _apply_defaults(self, entry: AuditEntry) -> AuditEntry:
+        """Fill unset context fields from the logger config."""
         if not entry.pipeline_id:
             entry.pipeline_id = self.pipeline_id
         if not entry.pipeline_name:
             entry.pipeline_name = self.pipeline_name
         if entry.user_id == "system":
             entry.user_id = self.user_id
+        return entry
+    
+    def _count(self, entry: AuditEntry) -> None:
+        """Update the running summary counters. Caller must hold ``self._lock``."""
+        # Keyed by enum member; .value is resolved once per key in get_summary()
+        self._actions[entry.action] += 1
+        self._levels[entry.level] += 1
+        if self._first_timestamp is None:
+            self._first_timestamp = entry.timestamp
+        self._last_timestamp = entry.timestamp
+        self._entry_count += 1
+    
+    def log(self, entry: AuditEntry) -> AuditEntry:
+        """
+        Append an audit entry to the log.
         
-        # Compute hash chain
-        entry = entry.with_hash(self._last_hash)
-        
-        # Write to file
-        with open(self.audit_path, "a") as f:
-            f.write(entry.model_dump_json() + "\n")
+        Automatically adds hash chain and writes to file.
+        """
+        entry = self._apply_defaults(entry)
         
-        # Update state
-        self._last_hash = entry.entry_hash
-        self._entry_count += 1
+        with self._lock:
+            # Compute hash chain and write the hashed form verbatim
+            self._write(entry._chain(self._last_hash, self.hash_algo))
+            
+            # Update state
+            self._last_hash = entry.entry_hash
+            self._count(entry)
         
         return entry
     
+    def log_batch(self, entries: Iterable[AuditEntry]) -> list[AuditEntry]:
+        """
+        Append several audit entries with a single write.
+        
+        Entries are chained in order, exactly as if each had been passed
+        to ``log()``; only the I/O is coalesced.
+        """
+        batch = [self._apply_defaults(entry) for entry in entries]
+        if not batch:
+            return batch
+        
+        with self._lock:
+            previous_hash = self._last_hash
+            lines: list[bytes] = []
+            for entry in batch:
+                lines.append(entry._chain(previous_hash, self.hash_algo))
+                previous_hash = entry.entry_hash
+            
+            self._write(b"".join(lines), count=len(lines))
+            
+            self._last_hash = previous_hash
+            for entry in batch:
+                self._count(entry)
+        
+        return batch
+    
     def log_action(
         self,
         action: AuditAction,
@@ -240,10 +614,11 @@ class AuditLogger:
         output_hash: str | None = None,
         duration_ms: int | None = None,
         details: dict[str, Any] | None = None,
+        pipeline_id: str | None = None,
     ) -> AuditEntry:
         """Convenience method to log an action."""
         entry = AuditEntry(
-            pipeline_id=self.pipeline_id,
+            pipeline_id=pipeline_id or self.pipeline_id,
             pipeline_name=self.pipeline_name,
             stage=stage,
             action=action,
@@ -383,60 +758,141 @@ class AuditLogger:
             },
         )
     
-    def read_all(self) -> list[AuditEntry]:
-        """Read all audit entries from the log file."""
+    def log_start(
+        self,
+        pipeline_id: str,
+        stage: str,
+        operation: str,
+        details: dict[str, Any] | None = None,
+    ) -> AuditEntry:
+        """Log the start of an operation in a pipeline stage."""
+        return self.log_action(
+            action=AuditAction.PIPELINE_START,
+            stage=stage,
+            resource_type="operation",
+            resource_id=operation,
+            details=details,
+            pipeline_id=pipeline_id,
+        )
+    
+    def log_complete(
+        self,
+        pipeline_id: str,
+        stage: str,
+        operation: str,
+        record_count: int | None = None,
+        duration_ms: int | None = None,
+        details: dict[str, Any] | None = None,
+    ) -> AuditEntry:
+        """Log successful completion of an operation."""
+        return self.log_action(
+            action=AuditAction.PIPELINE_COMPLETE,
+            stage=stage,
+            resource_type="operation",
+            resource_id=operation,
+            record_count=record_count,
+            duration_ms=duration_ms,
+            details=details,
+            pipeline_id=pipeline_id,
+        )
+    
+    def log_failure(
+        self,
+        pipeline_id: str,
+        stage: str,
+        operation: str,
+        error: str,
+        details: dict[str, Any] | None = None,
+    ) -> AuditEntry:
+        """Log a failed operation."""
+        return self.log_action(
+            action=AuditAction.PIPELINE_FAILED,
+            stage=stage,
+            level=AuditLevel.ERROR,
+            resource_type="operation",
+            resource_id=operation,
+            details={"error": error, **(details or {})},
+            pipeline_id=pipeline_id,
+        )
+    
+    def iter_entries(self) -> Iterator[AuditEntry]:
+        """Yield audit entries from the log file one at a time."""
+        self.flush()
         if not self.audit_path.exists():
-            return []
+            return
         
-        entries = []
-        with open(self.audit_path, "r") as f:
+        with open(self.audit_path, "rb") as f:
             for line in f:
                 if line.strip():
-                    entries.append(AuditEntry.model_validate_json(line))
-        return entries
+                    yield AuditEntry.model_validate_json(line)
+    
+    def read_all(self) -> list[AuditEntry]:
+        """Read all audit entries from the log file."""
+        return list(self.iter_entries())
     
     def verify_chain_integrity(self) -> tuple[bool, list[str]]:
         """
         Verify the integrity of the entire audit log.
         
+        Lines are streamed and hashed from their raw bytes, so memory use
+        does not grow with the log and entries are not rebuilt as models.
+        
         Returns:
             Tuple of (is_valid, list of error messages)
         """
-        entries = self.read_all()
         errors: list[str] = []
         
-        if not entries:
+        self.flush()
+        if not self.audit_path.exists():
             return True, []
         
         previous_hash = ""
         
-        for i, entry in enumerate(entries):
-            # Verify entry hash
-            if not entry.verify_integrity():
-                errors.append(
-                    f"Entry {i} ({entry.entry_id}): Hash mismatch - "
-                    f"expected {entry.compute_hash()}, got {entry.entry_hash}"
-                )
+        with open(self.audit_path, "rb") as f:
+            lines = (line.rstrip() for line in f if line.strip())
             
-            # Verify chain linkage
-            if entry.previous_hash != previous_hash:
-                errors.append(
-                    f"Entry {i} ({entry.entry_id}): Chain broken - "
-                    f"expected previous_hash {previous_hash}, got {entry.previous_hash}"
-                )
-            
-            previous_hash = entry.entry_hash
+            for i, line in enumerate(lines):
+                data, expected = _rehash_line(line)
+                entry_id = data.get("entry_id")
+                entry_hash = data.get("entry_hash", "")
+                
+                # Verify entry hash
+                if expected is None:
+                    errors.append(
+                        f"Entry {i} ({entry_id}): Unsupported hash "
+                        f"algorithm in entry_hash {entry_hash}"
+                    )
+                elif entry_hash != expected:
+                    errors.append(
+                        f"Entry {i} ({entry_id}): Hash mismatch - "
+                        f"expected {expected}, got {entry_hash}"
+                    )
+                
+                # Verify chain linkage
+                if data.get("previous_hash", "") != previous_hash:
+                    errors.append(
+                        f"Entry {i} ({entry_id}): Chain broken - "
+                        f"expected previous_hash {previous_hash}, "
+                        f"got {data.get('previous_hash', '')}"
+                    )
+                
+                previous_hash = entry_hash
         
         return len(errors) == 0, errors
     
     def export_csv(self, output_path: str | Path) -> int:
-        """Export audit log to CSV format."""
+        """
+        Export audit log to CSV format.
+        
+        Rows are written straight from the parsed JSONL lines, without
+        building AuditEntry models.
+        """
         import csv
         
-        entries = self.read_all()
         output_path = Path(output_path)
         
-        if not entries:
+        self.flush()
+        if not self.audit_path.exists():
             return 0
         
         fieldnames = [
@@ -444,43 +900,82 @@ class AuditLogger:
             "stage", "user_id", "resource_type", "resource_id",
             "record_count", "duration_ms", "entry_hash",
         ]
+        other_fields = fieldnames[1:]
         
-        with open(output_path, "w", newline="") as f:
-            writer = csv.DictWriter(f, fieldnames=fieldnames)
-            writer.writeheader()
+        count = 0
+        with open(self.audit_path, "rb") as src:
+            lines = (line for line in src if line.strip())
+            first = next(lines, None)
+            if first is None:
+                return 0
             
-            for entry in entries:
-                row = {
-                    k: getattr(entry, k, "")
-                    for k in fieldnames
-                }
-                row["timestamp"] = entry.timestamp.isoformat()
-                writer.writerow(row)
+            with open(output_path, "w", newline="") as f:
+                writer = csv.writer(f)
+                writer.writerow(fieldnames)
+                
+                for line in itertools.chain((first,), lines):
+                    data = _loads(line)
+                    # Normalize both on-disk timestamp layouts to ISO 8601
+                    row = [datetime.fromisoformat(data["timestamp"]).isoformat()]
+                    row.extend(data.get(k, "") for k in other_fields)
+                    writer.writerow(row)
+                    count += 1
+        
+        return count
+    
+    def _load_counters(self) -> None:
+        """
+        Rebuild the summary counters from the file. Caller must hold the lock.
+        
+        Counts are taken in one pass over the parsed lines, without building
+        AuditEntry models; only the first and last timestamps are parsed.
+        """
+        actions: Counter[str] = Counter()
+        levels: Counter[str] = Counter()
+        first = last = None
         
-        return len(entries)
+        self.flush()
+        if self.audit_path.exists():
+            with open(self.audit_path, "rb") as f:
+                for line in f:
+                    if not line.strip():
+                        continue
+                    data = _loads(line)
+                    actions[data["action"]] += 1
+                    levels[data.get("level", AuditLevel.INFO.value)] += 1
+                    last = data["timestamp"]
+                    if first is None:
+                        first = last
+        
+        self._actions = Counter({AuditAction(a): n for a, n in actions.items()})
+        self._levels = Counter({AuditLevel(lv): n for lv, n in levels.items()})
+        self._entry_count = actions.total()
+        self._first_timestamp = datetime.fromisoformat(first) if first else None
+        self._last_timestamp = datetime.fromisoformat(last) if last else None
+        self._counters_loaded = True
     
     def get_summary(self) -> dict[str, Any]:
-        """Get summary statistics for the audit log."""
-        entries = self.read_all()
-        
-        if not entries:
-            return {"total_entries": 0}
-        
-        actions = {}
-        levels = {}
-        
-        for entry in entries:
-            actions[entry.action.value] = actions.get(entry.action.value, 0) + 1
-            levels[entry.level.value] = levels.get(entry.level.value, 0) + 1
-        
-        return {
-            "total_entries": len(entries),
-            "first_entry": entries[0].timestamp.isoformat(),
-            "last_entry": entries[-1].timestamp.isoformat(),
-            "actions": actions,
-            "levels": levels,
-            "pipeline_id": self.pipeline_id,
-        }
+        """
+        Get summary statistics for the audit log.
+        
+        Served from running counters; an existing file is scanned once, on
+        the first call.
+        """
+        with self._lock:
+            if not self._counters_loaded:
+                self._load_counters()
+            
+            if self._first_timestamp is None or self._last_timestamp is None:
+                return {"total_entries": 0}
+            
+            return {
+                "total_entries": self._entry_count,
+                "first_entry": self._first_timestamp.isoformat(),
+                "last_entry": self._last_timestamp.isoformat(),
+                "actions": {a.value: n for a, n in self._actions.items()},
+                "levels": {lv.value: n for lv, n in self._levels.items()},
+                "pipeline_id": self.pipeline_id,
+            }
 
 
 # =============================================================================
@@ -7,14 +7,17 @@ Supports graph traversal, impact analysis, and compliance reporting.
 
 from __future__ import annotations
 
-import json
-import uuid
+import secrets
+from collections import defaultdict, deque
 from datetime import datetime, timezone
 from enum import Enum
 from pathlib import Path
-from typing import Any
+from typing import Any, BinaryIO, cast
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, TypeAdapter
+
+from ._ids import uuid4_str
+from ._json import loads as _loads
 
 
 # =============================================================================
@@ -41,6 +44,9 @@ class SourceType(str, Enum):
     AZURE_BLOB = "azure_blob"
 
 
+_SOURCE_TYPES = {s.value: s for s in SourceType}
+
+
 # =============================================================================
 # LINEAGE MODELS
 # =============================================================================
@@ -49,7 +55,7 @@ class SourceType(str, Enum):
 class LineageNode(BaseModel):
     """A node in the lineage graph."""
     
-    node_id: str = Field(default_factory=lambda: str(uuid.uuid4())[:12])
+    node_id: str = Field(default_factory=lambda: uuid4_str()[:12])
     node_type: NodeType
     name: str
     
@@ -68,7 +74,7 @@ class LineageNode(BaseModel):
 class LineageEdge(BaseModel):
     """An edge connecting two nodes in the lineage graph."""
     
-    edge_id: str = Field(default_factory=lambda: str(uuid.uuid4())[:12])
+    edge_id: str = Field(default_factory=lambda: uuid4_str()[:12])
     source_node_id: str
     target_node_id: str
     
@@ -103,7 +109,7 @@ class LineageRecord(BaseModel):
     Captures source, transformation, and destination in one record.
     """
     
-    lineage_id: str = Field(default_factory=lambda: str(uuid.uuid4()))
+    lineage_id: str = Field(default_factory=uuid4_str)
     timestamp: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
     
     # Source information
@@ -141,6 +147,10 @@ class LineageRecord(BaseModel):
 # =============================================================================
 
 
+_RECORDS_ADAPTER = TypeAdapter(list[LineageRecord])
+_SAVE_ADAPTER = TypeAdapter(dict[str, Any])
+
+
 class LineageTracker:
     """
     Track and query data lineage.
@@ -150,15 +160,48 @@ class LineageTracker:
     - Querying lineage history
     - Impact analysis
     - Graph traversal
+    
+    With ``stream_path`` each record is also appended to a JSONL file as it
+    is recorded (readable with ``load()``). Pass ``retain_records=False`` as
+    well to keep only the summary totals in memory for long-running pipelines;
+    record queries and the graph are then empty.
     """
     
-    def __init__(self, pipeline_id: str = "", run_id: str = ""):
-        self.pipeline_id = pipeline_id or str(uuid.uuid4())[:8]
-        self.run_id = run_id or str(uuid.uuid4())[:8]
+    def __init__(
+        self,
+        pipeline_id: str = "",
+        run_id: str = "",
+        stream_path: str | Path | None = None,
+        retain_records: bool = True,
+    ):
+        self.pipeline_id = pipeline_id or secrets.token_hex(4)
+        self.run_id = run_id or secrets.token_hex(4)
+        self.stream_path = Path(stream_path) if stream_path is not None else None
+        self.retain_records = retain_records
+        self._stream: BinaryIO | None = None
         
         self._records: list[LineageRecord] = []
+        self._records_by_id: dict[str, LineageRecord] = {}
+        self._parent_of: dict[str, str | None] = {}
+        self._by_source: defaultdict[str, list[LineageRecord]] = defaultdict(list)
+        self._by_destination: defaultdict[str, list[LineageRecord]] = defaultdict(list)
+        
+        # Running totals for summary()
+        self._record_count = 0
+        self._total_input = 0
+        self._total_output = 0
+        self._total_filtered = 0
+        self._total_failed = 0
+        self._unique_sources: set[str] = set()
+        self._unique_destinations: set[str] = set()
+        self._unique_transforms: set[str] = set()
+        
+        # get_descendants() results per source, until the next record
+        self._descendants: dict[str, list[LineageRecord]] = {}
+        # Graph view, built on demand from the records
         self._nodes: dict[str, LineageNode] = {}
         self._edges: list[LineageEdge] = []
+        self._graph_size = 0  # Number of records reflected in the graph
     
     def record(
         self,
@@ -183,10 +226,11 @@ class LineageTracker:
         Returns:
             The created LineageRecord
         """
-        if isinstance(source_type, str):
-            source_type = SourceType(source_type)
-        if isinstance(destination_type, str):
-            destination_type = SourceType(destination_type)
+        # Plain dict lookup for known values; SourceType() raises otherwise
+        source_type = _SOURCE_TYPES.get(source_type) or SourceType(source_type)
+        destination_type = (
+            _SOURCE_TYPES.get(destination_type) or SourceType(destination_type)
+        )
         
         record = LineageRecord(
             source_type=source_type,
@@ -207,44 +251,99 @@ class LineageTracker:
             duration_ms=duration_ms,
         )
         
-        self._records.append(record)
-        
-        # Also create graph representation
-        self._add_to_graph(record)
+        self._add_record(record)
+        if self.stream_path is not None:
+            self._append(record, self.stream_path)
         
         return record
     
+    def _append(self, record: LineageRecord, stream_path: Path) -> None:
+        """Append a record to the JSONL stream, opening it on first use."""
+        if self._stream is None:
+            stream_path.parent.mkdir(parents=True, exist_ok=True)
+            self._stream = open(stream_path, "ab")
+        self._stream.write(record.model_dump_json(fallback=str).encode() + b"\n")
+        self._stream.flush()
+    
+    def close(self) -> None:
+        """Close the JSONL stream, if one is open."""
+        if self._stream is not None:
+            self._stream.close()
+            self._stream = None
+    
+    def __enter__(self) -> "LineageTracker":
+        return self
+    
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+    
+    def _add_record(self, record: LineageRecord) -> None:
+        """Store a record and update the indexes and running totals."""
+        self._total_input += record.input_records
+        self._total_output += record.output_records
+        self._total_filtered += record.records_filtered
+        self._total_failed += record.records_failed
+        self._unique_sources.add(record.source_location)
+        self._unique_destinations.add(record.destination_location)
+        self._unique_transforms.add(record.transformation)
+        self._record_count += 1
+        
+        if not self.retain_records:
+            return
+        
+        self._records.append(record)
+        self._records_by_id[record.lineage_id] = record
+        self._parent_of[record.lineage_id] = record.parent_lineage_id
+        self._by_source[record.source_location].append(record)
+        self._by_destination[record.destination_location].append(record)
+        if self._descendants:
+            self._descendants.clear()
+    
+    def _build_graph(self) -> None:
+        """Bring the graph up to date with records added since the last build."""
+        for record in self._records[self._graph_size:]:
+            self._add_to_graph(record)
+        self._graph_size = len(self._records)
+    
     def _add_to_graph(self, record: LineageRecord) -> None:
         """Add lineage record to the internal graph."""
+        nodes = self._nodes
+        # Stamp graph objects with the record's time rather than reading the
+        # clock for each one (this also keeps reloaded graphs faithful)
+        timestamp = record.timestamp
+        
         # Create/update source node
         source_id = f"src_{record.source_location}"
-        if source_id not in self._nodes:
-            self._nodes[source_id] = LineageNode(
+        if source_id not in nodes:
+            nodes[source_id] = LineageNode(
                 node_id=source_id,
                 node_type=NodeType.SOURCE,
                 name=record.source_location,
                 source_type=record.source_type,
                 location=record.source_location,
+                created_at=timestamp,
             )
         
         # Create transform node
         transform_id = f"txn_{record.lineage_id[:8]}"
-        self._nodes[transform_id] = LineageNode(
+        nodes[transform_id] = LineageNode(
             node_id=transform_id,
             node_type=NodeType.TRANSFORM,
             name=record.transformation,
             properties={"version": record.transformation_version},
+            created_at=timestamp,
         )
         
         # Create/update destination node
         dest_id = f"dst_{record.destination_location}"
-        if dest_id not in self._nodes:
-            self._nodes[dest_id] = LineageNode(
+        if dest_id not in nodes:
+            nodes[dest_id] = LineageNode(
                 node_id=dest_id,
                 node_type=NodeType.DESTINATION,
                 name=record.destination_location,
                 source_type=record.destination_type,
                 location=record.destination_location,
+                created_at=timestamp,
             )
         
         # Create edges
@@ -254,6 +353,7 @@ class LineageTracker:
             operation="input",
             input_records=record.input_records,
             input_hash=record.source_hash or "",
+            started_at=timestamp,
             pipeline_id=self.pipeline_id,
             run_id=self.run_id,
         ))
@@ -268,6 +368,7 @@ class LineageTracker:
             records_filtered=record.records_filtered,
             records_failed=record.records_failed,
             output_hash=record.destination_hash or "",
+            started_at=timestamp,
             duration_ms=record.duration_ms,
             pipeline_id=self.pipeline_id,
             run_id=self.run_id,
@@ -275,49 +376,54 @@ class LineageTracker:
     
     def get_lineage(self, lineage_id: str) -> LineageRecord | None:
         """Get a specific lineage record."""
-        for record in self._records:
-            if record.lineage_id == lineage_id:
-                return record
-        return None
+        return self._records_by_id.get(lineage_id)
     
     def get_by_source(self, source_location: str) -> list[LineageRecord]:
         """Get all records with a specific source."""
-        return [r for r in self._records if r.source_location == source_location]
+        return list(self._by_source.get(source_location, ()))
     
     def get_by_destination(self, destination_location: str) -> list[LineageRecord]:
         """Get all records with a specific destination."""
-        return [r for r in self._records if r.destination_location == destination_location]
+        return list(self._by_destination.get(destination_location, ()))
     
     def get_ancestors(self, lineage_id: str) -> list[LineageRecord]:
         """Get all ancestor records in the lineage chain."""
-        ancestors = []
+        # Walk the id -> parent id map; records are only fetched at the end
+        parent_of = self._parent_of
+        chain = []
         current_id: str | None = lineage_id
         
-        while current_id:
-            record = self.get_lineage(current_id)
-            if record:
-                ancestors.append(record)
-                current_id = record.parent_lineage_id
-            else:
-                break
+        while current_id and current_id in parent_of:
+            chain.append(current_id)
+            current_id = parent_of[current_id]
         
-        return ancestors
+        return [self._records_by_id[i] for i in chain]
     
     def get_descendants(self, source_location: str) -> list[LineageRecord]:
-        """Get all downstream records from a source."""
+        """
+        Get all downstream records from a source.
+        
+        Results are cached per source until another record is added.
+        """
+        cached = self._descendants.get(source_location)
+        if cached is None:
+            cached = self._walk_descendants(source_location)
+            self._descendants[source_location] = cached
+        return list(cached)
+    
+    def _walk_descendants(self, source_location: str) -> list[LineageRecord]:
+        """Breadth-first walk of the records downstream of a source."""
         descendants = []
-        to_check = [source_location]
-        seen = set()
+        to_check = deque([source_location])
+        seen = {source_location}
         
         while to_check:
-            current = to_check.pop(0)
-            if current in seen:
-                continue
-            seen.add(current)
+            current = to_check.popleft()
             
-            for record in self._records:
-                if record.source_location == current:
-                    descendants.append(record)
+            for record in self._by_source.get(current, ()):
+                descendants.append(record)
+                if record.destination_location not in seen:
+                    seen.add(record.destination_location)
                     to_check.append(record.destination_location)
         
         return descendants
@@ -348,31 +454,31 @@ class LineageTracker:
         }
     
     def summary(self) -> dict[str, Any]:
-        """Get summary statistics for all lineage."""
-        total_input = sum(r.input_records for r in self._records)
-        total_output = sum(r.output_records for r in self._records)
-        total_filtered = sum(r.records_filtered for r in self._records)
-        total_failed = sum(r.records_failed for r in self._records)
+        """
+        Get summary statistics for all lineage.
         
+        Served from totals kept up to date as records are added.
+        """
         return {
             "pipeline_id": self.pipeline_id,
             "run_id": self.run_id,
-            "total_transformations": len(self._records),
-            "total_input_records": total_input,
-            "total_output_records": total_output,
-            "total_filtered_records": total_filtered,
-            "total_failed_records": total_failed,
-            "unique_sources": len(set(r.source_location for r in self._records)),
-            "unique_destinations": len(set(r.destination_location for r in self._records)),
-            "unique_transforms": len(set(r.transformation for r in self._records)),
+            "total_transformations": self._record_count,
+            "total_input_records": self._total_input,
+            "total_output_records": self._total_output,
+            "total_filtered_records": self._total_filtered,
+            "total_failed_records": self._total_failed,
+            "unique_sources": len(self._unique_sources),
+            "unique_destinations": len(self._unique_destinations),
+            "unique_transforms": len(self._unique_transforms),
         }
     
     def export(self) -> list[dict[str, Any]]:
         """Export all lineage records as dictionaries."""
-        return [r.model_dump() for r in self._records]
+        return cast(list[dict[str, Any]], _RECORDS_ADAPTER.dump_python(self._records))
     
     def export_graph(self) -> dict[str, Any]:
         """Export the lineage graph."""
+        self._build_graph()
         return {
             "nodes": [n.model_dump() for n in self._nodes.values()],
             "edges": [e.model_dump() for e in self._edges],
@@ -383,34 +489,58 @@ class LineageTracker:
         path = Path(path)
         path.parent.mkdir(parents=True, exist_ok=True)
         
+        self._build_graph()
+        
+        # Models are serialized by pydantic-core in one call, without
+        # building intermediate dicts for every record, node and edge
         data = {
             "pipeline_id": self.pipeline_id,
             "run_id": self.run_id,
-            "records": self.export(),
-            "graph": self.export_graph(),
+            "records": self._records,
+            "graph": {
+                "nodes": list(self._nodes.values()),
+                "edges": self._edges,
+            },
             "summary": self.summary(),
         }
         
-        with open(path, "w") as f:
-            json.dump(data, f, indent=2, default=str)
+        path.write_bytes(_SAVE_ADAPTER.dump_json(data, indent=2, fallback=str))
     
     @classmethod
     def load(cls, path: str | Path) -> "LineageTracker":
-        """Load lineage from a JSON file."""
-        with open(path, "r") as f:
-            data = json.load(f)
+        """Load lineage from a JSON file, or a ``.jsonl`` record stream."""
+        path = Path(path)
+        if path.suffix == ".jsonl":
+            return cls._load_stream(path)
+        
+        data = _loads(path.read_bytes())
         
         tracker = cls(
             pipeline_id=data.get("pipeline_id", ""),
             run_id=data.get("run_id", ""),
         )
         
-        for record_data in data.get("records", []):
-            record = LineageRecord.model_validate(record_data)
-            tracker._records.append(record)
-            tracker._add_to_graph(record)
+        # Validate every record in one pydantic-core call
+        for record in _RECORDS_ADAPTER.validate_python(data.get("records", [])):
+            tracker._add_record(record)
         
         return tracker
+    
+    @classmethod
+    def _load_stream(cls, path: Path) -> "LineageTracker":
+        """Load records appended one per line by a streaming tracker."""
+        tracker: LineageTracker | None = None
+        
+        with open(path, "rb") as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                record = LineageRecord.model_validate_json(line)
+                if tracker is None:
+                    tracker = cls(pipeline_id=record.pipeline_id, run_id=record.run_id)
+                tracker._add_record(record)
+        
+        return tracker if tracker is not None else cls()
 
 
 # =============================================================================
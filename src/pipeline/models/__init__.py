@@ -14,6 +14,8 @@ from .healthcare import (
     LabResult,
     ClaimLine,
     Claim,
+    compute_abnormal_bulk,
+    validate_npi_bulk,
 )
 
 __all__ = [
@@ -30,4 +32,6 @@ __all__ = [
     "LabResult",
     "ClaimLine",
     "Claim",
+    "compute_abnormal_bulk",
+    "validate_npi_bulk",
 ]
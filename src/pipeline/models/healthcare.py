@@ -8,11 +8,13 @@ All models include validation, serialization, and PHI tracking.
 from __future__ import annotations
 
 import re
-from datetime import date, datetime
+import secrets
+from datetime import date, datetime, timezone
 from enum import Enum
-from typing import Annotated, Any
-from uuid import uuid4
+from functools import cached_property
+from typing import Annotated, Any, ClassVar, Iterable, Mapping, cast
 
+import numpy as np
 from pydantic import (
     BaseModel,
     ConfigDict,
@@ -21,6 +23,32 @@ from pydantic import (
     model_validator,
 )
 
+from .._luhn import luhn_sum
+
+
+# Strips formatting from SSN, phone and ZIP values
+_NON_DIGIT = re.compile(r"[^0-9]")
+_NON_DIGIT_BYTES = bytes(c for c in range(256) if not 0x30 <= c <= 0x39)
+
+
+# __dict__ key of Patient's memoized (as-of date, age)
+_AGE_MEMO = "age_memo"
+
+
+def _age_on(date_of_birth: date, today: date) -> int:
+    """Age in whole years on ``today``."""
+    return today.year - date_of_birth.year - (
+        (today.month, today.day) < (date_of_birth.month, date_of_birth.day)
+    )
+
+
+def _digits(v: str) -> str:
+    """Keep only the ASCII digits of a string."""
+    if v.isascii():
+        # bytes.translate deletes in one C pass, without the regex engine
+        return v.encode().translate(None, _NON_DIGIT_BYTES).decode()
+    return _NON_DIGIT.sub("", v)
+
 
 # =============================================================================
 # ENUMS
@@ -88,16 +116,34 @@ class HealthcareBaseModel(BaseModel):
         extra="forbid",
     )
 
-    def phi_fields(self) -> list[str]:
-        """Return list of PHI field names for this model."""
-        return []
+    # PHI field names for this model
+    PHI_FIELDS: ClassVar[frozenset[str]] = frozenset()
+
+    def phi_fields(self) -> frozenset[str]:
+        """Return the PHI field names for this model."""
+        return self.PHI_FIELDS
 
     def to_safe_dict(self) -> dict[str, Any]:
-        """Export model with PHI fields redacted."""
-        data = self.model_dump()
-        for field in self.phi_fields():
-            if field in data:
-                data[field] = "[REDACTED]"
+        """
+        Export model with PHI fields redacted.
+
+        Scalar values are copied straight from the model; only nested models
+        and containers go through model_dump().
+        """
+        phi = self.phi_fields()
+        values = self.__dict__
+        data: dict[str, Any] = {}
+        nested = set()
+        for name in type(self).model_fields:
+            if name in phi:
+                data[name] = "[REDACTED]"
+                continue
+            value = values[name]
+            if isinstance(value, (BaseModel, list, dict)):
+                nested.add(name)
+            data[name] = value
+        if nested:
+            data.update(self.model_dump(include=nested))
         return data
 
 
@@ -120,7 +166,7 @@ class Patient(HealthcareBaseModel):
     """
 
     # Identifiers
-    patient_id: str = Field(default_factory=lambda: f"pat_{uuid4().hex[:12]}")
+    patient_id: str = Field(default_factory=lambda: f"pat_{secrets.token_hex(6)}")
     mrn: str = Field(..., min_length=1, max_length=20, description="Medical Record Number")
     ssn: str | None = Field(default=None, description="Social Security Number (XXX-XX-XXXX)")
 
@@ -143,10 +189,28 @@ class Patient(HealthcareBaseModel):
     zip_code: str | None = Field(default=None, max_length=10)
 
     # Metadata
-    created_at: datetime = Field(default_factory=datetime.utcnow)
-    updated_at: datetime = Field(default_factory=datetime.utcnow)
+    created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+    updated_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
     is_active: bool = True
 
+    def __setattr__(self, name: str, value: Any) -> None:
+        super().__setattr__(name, value)
+        # Drop derived values computed from the old field value
+        if name in ("first_name", "middle_name", "last_name"):
+            self.__dict__.pop("full_name", None)
+        elif name == "date_of_birth":
+            self.__dict__.pop(_AGE_MEMO, None)
+
+    def model_copy(
+        self, *, update: Mapping[str, Any] | None = None, deep: bool = False
+    ) -> "Patient":
+        copy = super().model_copy(update=update, deep=deep)
+        if update:
+            # update= bypasses __setattr__, so reset derived values here
+            copy.__dict__.pop("full_name", None)
+            copy.__dict__.pop(_AGE_MEMO, None)
+        return copy
+
     @field_validator("ssn")
     @classmethod
     def validate_ssn(cls, v: str | None) -> str | None:
@@ -154,7 +218,7 @@ class Patient(HealthcareBaseModel):
         if v is None:
             return None
         # Remove any formatting
-        clean = re.sub(r"[^0-9]", "", v)
+        clean = _digits(v)
         if len(clean) != 9:
             raise ValueError("SSN must be 9 digits")
         # Format consistently
@@ -166,7 +230,7 @@ class Patient(HealthcareBaseModel):
         """Normalize phone number format."""
         if v is None:
             return None
-        clean = re.sub(r"[^0-9]", "", v)
+        clean = _digits(v)
         if len(clean) == 10:
             return f"({clean[:3]}) {clean[3:6]}-{clean[6:]}"
         elif len(clean) == 11 and clean[0] == "1":
@@ -179,7 +243,7 @@ class Patient(HealthcareBaseModel):
         """Validate ZIP code format."""
         if v is None:
             return None
-        clean = re.sub(r"[^0-9]", "", v)
+        clean = _digits(v)
         if len(clean) == 5:
             return clean
         elif len(clean) == 9:
@@ -196,15 +260,14 @@ class Patient(HealthcareBaseModel):
             raise ValueError("Invalid email format")
         return v.lower()
 
-    def phi_fields(self) -> list[str]:
-        """PHI fields per HIPAA Safe Harbor."""
-        return [
-            "mrn", "ssn", "first_name", "last_name", "middle_name",
-            "date_of_birth", "email", "phone",
-            "address_line1", "address_line2", "city", "state", "zip_code",
-        ]
+    # PHI fields per HIPAA Safe Harbor
+    PHI_FIELDS: ClassVar[frozenset[str]] = frozenset({
+        "mrn", "ssn", "first_name", "last_name", "middle_name",
+        "date_of_birth", "email", "phone",
+        "address_line1", "address_line2", "city", "state", "zip_code",
+    })
 
-    @property
+    @cached_property
     def full_name(self) -> str:
         """Full name string."""
         parts = [self.first_name]
@@ -215,11 +278,22 @@ class Patient(HealthcareBaseModel):
 
     @property
     def age(self) -> int:
-        """Calculate current age in years."""
+        """Calculate current age in years (recomputed once per day)."""
         today = date.today()
-        return today.year - self.date_of_birth.year - (
-            (today.month, today.day) < (self.date_of_birth.month, self.date_of_birth.day)
-        )
+        cached = self.__dict__.get(_AGE_MEMO)
+        if cached is not None and cached[0] == today:
+            return cast(int, cached[1])
+        age = _age_on(self.date_of_birth, today)
+        # Kept in __dict__ like cached_property values, outside the fields
+        # and private attributes that model equality compares
+        self.__dict__[_AGE_MEMO] = (today, age)
+        return age
+
+    @classmethod
+    def ages_bulk(cls, patients: Iterable["Patient"], today: date | None = None) -> list[int]:
+        """Ages in years for many patients, as of one shared ``today``."""
+        today = today or date.today()
+        return [_age_on(p.date_of_birth, today) for p in patients]
 
 
 # =============================================================================
@@ -250,7 +324,7 @@ class Encounter(HealthcareBaseModel):
     Links to patient and contains clinical information.
     """
 
-    encounter_id: str = Field(default_factory=lambda: f"enc_{uuid4().hex[:12]}")
+    encounter_id: str = Field(default_factory=lambda: f"enc_{secrets.token_hex(6)}")
     patient_id: str
     
     # Encounter details
@@ -278,8 +352,8 @@ class Encounter(HealthcareBaseModel):
     notes: str | None = None
     
     # Metadata
-    created_at: datetime = Field(default_factory=datetime.utcnow)
-    updated_at: datetime = Field(default_factory=datetime.utcnow)
+    created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+    updated_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
 
     @model_validator(mode="after")
     def validate_timing(self) -> "Encounter":
@@ -289,9 +363,10 @@ class Encounter(HealthcareBaseModel):
                 raise ValueError("End time cannot be before start time")
         return self
 
-    def phi_fields(self) -> list[str]:
-        """Encounter-level PHI fields."""
-        return ["patient_id", "notes", "chief_complaint"]
+    # Encounter-level PHI fields
+    PHI_FIELDS: ClassVar[frozenset[str]] = frozenset({
+        "patient_id", "notes", "chief_complaint",
+    })
 
     @property
     def duration_minutes(self) -> int | None:
@@ -322,7 +397,7 @@ class LabResult(HealthcareBaseModel):
     Includes reference ranges and abnormal flag logic.
     """
 
-    result_id: str = Field(default_factory=lambda: f"lab_{uuid4().hex[:12]}")
+    result_id: str = Field(default_factory=lambda: f"lab_{secrets.token_hex(6)}")
     patient_id: str
     encounter_id: str | None = None
     
@@ -353,7 +428,7 @@ class LabResult(HealthcareBaseModel):
     performing_lab: str | None = None
     
     # Metadata
-    created_at: datetime = Field(default_factory=datetime.utcnow)
+    created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
 
     @model_validator(mode="after")
     def compute_abnormal(self) -> "LabResult":
@@ -367,9 +442,28 @@ class LabResult(HealthcareBaseModel):
                 self.is_abnormal = False
         return self
 
-    def phi_fields(self) -> list[str]:
-        """Lab result PHI fields."""
-        return ["patient_id"]
+    # Lab result PHI fields
+    PHI_FIELDS: ClassVar[frozenset[str]] = frozenset({"patient_id"})
+
+
+def compute_abnormal_bulk(
+    value_numeric: np.ndarray,
+    reference_low: np.ndarray,
+    reference_high: np.ndarray,
+) -> np.ndarray:
+    """
+    Vectorized abnormal flags for a batch of lab results.
+
+    Takes column arrays with NaN for missing values and applies the same
+    range rule as ``LabResult.compute_abnormal`` in one pass. Rows with no
+    numeric value or no reference range come back False (the validator
+    leaves those as None).
+    """
+    value = np.asarray(value_numeric, dtype=np.float64)
+    # Comparisons against NaN are False, so missing bounds never flag
+    return (value < np.asarray(reference_low, dtype=np.float64)) | (
+        value > np.asarray(reference_high, dtype=np.float64)
+    )
 
 
 # =============================================================================
@@ -401,7 +495,7 @@ class Claim(HealthcareBaseModel):
     Contains billing and payment information.
     """
 
-    claim_id: str = Field(default_factory=lambda: f"clm_{uuid4().hex[:12]}")
+    claim_id: str = Field(default_factory=lambda: f"clm_{secrets.token_hex(6)}")
     patient_id: str
     encounter_id: str | None = None
     
@@ -441,8 +535,8 @@ class Claim(HealthcareBaseModel):
     adjudicated_at: datetime | None = None
     
     # Metadata
-    created_at: datetime = Field(default_factory=datetime.utcnow)
-    updated_at: datetime = Field(default_factory=datetime.utcnow)
+    created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+    updated_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
 
     @field_validator("billing_provider_npi", "rendering_provider_npi", "facility_npi")
     @classmethod
@@ -453,22 +547,12 @@ class Claim(HealthcareBaseModel):
         if not v.isdigit() or len(v) != 10:
             raise ValueError("NPI must be exactly 10 digits")
         # Luhn check (with 80840 prefix for NPI)
-        npi_with_prefix = "80840" + v
-        total = 0
-        for i, digit in enumerate(reversed(npi_with_prefix)):
-            n = int(digit)
-            if i % 2 == 0:
-                n *= 2
-                if n > 9:
-                    n -= 9
-            total += n
-        if total % 10 != 0:
+        if luhn_sum("80840" + v, double_last=True) % 10 != 0:
             raise ValueError("Invalid NPI checksum")
         return v
 
-    def phi_fields(self) -> list[str]:
-        """Claim PHI fields."""
-        return ["patient_id", "member_id"]
+    # Claim PHI fields
+    PHI_FIELDS: ClassVar[frozenset[str]] = frozenset({"patient_id", "member_id"})
 
     @property
     def is_adjudicated(self) -> bool:
@@ -479,6 +563,66 @@ class Claim(HealthcareBaseModel):
         )
 
 
+# NPI prefix added before the Luhn check, and its share of the digit sum
+_NPI_PREFIX = "80840"
+_NPI_PREFIX_SUM = luhn_sum(_NPI_PREFIX + "0" * 10, double_last=True)
+
+# Digit -> digit sum of twice its value
+_LUHN_DOUBLED = np.array([0, 2, 4, 6, 8, 1, 3, 5, 7, 9], dtype=np.int64)
+
+
+def validate_npi_bulk(npis: Iterable[str | None]) -> np.ndarray:
+    """
+    Vectorized NPI checks for a batch of claims.
+
+    Applies the same format and checksum rule as ``Claim.validate_npi`` and
+    returns a boolean array, True where the NPI is valid. None and malformed
+    values come back False. Well-formed ASCII NPIs are checked as one
+    (N, 10) digit array.
+    """
+    npis = list(npis)
+    valid = np.zeros(len(npis), dtype=bool)
+    
+    # Common case: every value is a 10-digit ASCII string
+    joined: str | None = None
+    if all(type(v) is str for v in npis):
+        strs = cast("list[str]", npis)
+        joined = "".join(strs)
+        # A total of 10 * N characters with none longer than 10 means all are 10
+        if (
+            len(joined) != 10 * len(strs)
+            or max(map(len, strs), default=10) != 10
+            or not (joined.isascii() and joined.isdigit())
+        ):
+            joined = None
+    
+    rows: list[int] | slice = slice(None)
+    if joined is None:
+        rows = []
+        digits: list[str] = []
+        for i, v in enumerate(npis):
+            if not isinstance(v, str) or len(v) != 10 or not v.isdigit():
+                continue
+            if v.isascii():
+                rows.append(i)
+                digits.append(v)
+            else:
+                # Non-ASCII Unicode digits take the scalar path
+                valid[i] = luhn_sum(_NPI_PREFIX + v, double_last=True) % 10 == 0
+        joined = "".join(digits)
+    
+    if joined:
+        arr = np.frombuffer(joined.encode(), dtype=np.uint8).reshape(-1, 10) - 48
+        # The last digit sits in a doubled position (see Claim.validate_npi)
+        total = (
+            _NPI_PREFIX_SUM
+            + arr[:, 0::2].sum(axis=1, dtype=np.int64)
+            + _LUHN_DOUBLED[arr[:, 1::2]].sum(axis=1)
+        )
+        valid[rows] = total % 10 == 0
+    return valid
+
+
 # =============================================================================
 # EXPORTS
 # =============================================================================
@@ -500,4 +644,7 @@ __all__ = [
     "LabResult",
     "ClaimLine",
     "Claim",
+    # Bulk helpers
+    "compute_abnormal_bulk",
+    "validate_npi_bulk",
 ]
@@ -28,13 +28,20 @@ from __future__ import annotations
 
 import hashlib
 import re
+import secrets
+from bisect import bisect_right
 from dataclasses import dataclass
 from datetime import date, datetime
 from enum import Enum
-from typing import Any, Callable
+from functools import lru_cache
+from operator import attrgetter
+from typing import Any, Callable, ClassVar, Sequence
 
+import numpy as np
 from pydantic import BaseModel, Field
 
+from .._luhn import luhn_sum
+
 
 # =============================================================================
 # PII TYPES
@@ -83,6 +90,12 @@ class PIIType(str, Enum):
     OTHER = "other"
 
 
+# Per-type labels used by the masker, built once instead of per value
+_REDACT_LABELS = {t: f"[{t.value.upper()}_REDACTED]" for t in PIIType}
+_CATEGORY_LABELS = {t: f"[{t.value.upper()}]" for t in PIIType}
+_TOKEN_PREFIXES = {t: f"TOK_{t.value.upper()}_" for t in PIIType}
+
+
 # =============================================================================
 # PII DETECTION PATTERNS
 # =============================================================================
@@ -95,83 +108,113 @@ class PIIPattern:
     pattern: re.Pattern[str]
     confidence: float = 0.9
     validator: Callable[[str], bool] | None = None
+    # Every match contains at least one of these characters; ASCII text
+    # without any of them is skipped without running the regex
+    required_chars: str = ""
+
+
+_DIGITS = "0123456789"
+
+
+# Strips formatting from digit-based values
+_NON_DIGIT = re.compile(r"\D")
+_NON_DIGIT_BYTES = bytes(c for c in range(256) if not 0x30 <= c <= 0x39)
+
+
+def _digits(value: str) -> str:
+    """Remove every non-digit character from a string."""
+    if value.isascii():
+        # bytes.translate deletes in one C pass, without the regex engine
+        return value.encode().translate(None, _NON_DIGIT_BYTES).decode()
+    return _NON_DIGIT.sub("", value)
+
+
+# Match count from which overlapping matches are sorted with numpy
+_NUMPY_SORT_MIN = 64
+
 
+# Joins field values for a single scan_dict pass. No built-in pattern
+# matches a NUL, and \b treats it like the start or end of the text.
+_FIELD_SEPARATOR = "\x00"
 
-# Regex patterns for PII detection
-PII_PATTERNS: list[PIIPattern] = [
+
+# Regex patterns for PII detection (compiled once, shared by all detectors)
+PII_PATTERNS: tuple[PIIPattern, ...] = (
     # SSN: XXX-XX-XXXX or XXXXXXXXX
     PIIPattern(
         PIIType.SSN,
-        re.compile(r"\b(\d{3}[-\s]?\d{2}[-\s]?\d{4})\b"),
+        re.compile(r"\b\d{3}[-\s]?+\d{2}[-\s]?+\d{4}\b"),
         confidence=0.95,
-        validator=lambda x: len(re.sub(r"\D", "", x)) == 9,
+        validator=lambda x: len(_digits(x)) == 9,
+        required_chars=_DIGITS,
     ),
     
     # Email
     PIIPattern(
         PIIType.EMAIL,
-        re.compile(r"\b([a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,})\b"),
+        re.compile(r"\b[a-zA-Z0-9._%+-]++@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}\b"),
         confidence=0.98,
+        required_chars="@",
     ),
     
     # Phone: various formats
     PIIPattern(
         PIIType.PHONE,
-        re.compile(r"\b(\+?1?[-.\s]?\(?\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4})\b"),
+        re.compile(r"\b\+?1?[-.\s]?\(?\d{3}\)?[-.\s]?+\d{3}[-.\s]?+\d{4}\b"),
         confidence=0.85,
-        validator=lambda x: 10 <= len(re.sub(r"\D", "", x)) <= 11,
+        validator=lambda x: 10 <= len(_digits(x)) <= 11,
+        required_chars=_DIGITS,
     ),
     
     # Credit Card (basic patterns)
     PIIPattern(
         PIIType.CREDIT_CARD,
-        re.compile(r"\b(\d{4}[-\s]?\d{4}[-\s]?\d{4}[-\s]?\d{4})\b"),
+        re.compile(r"\b\d{4}[-\s]?+\d{4}[-\s]?+\d{4}[-\s]?+\d{4}\b"),
         confidence=0.90,
-        validator=lambda x: _luhn_check(re.sub(r"\D", "", x)),
+        validator=lambda x: _luhn_check(_digits(x)),
+        required_chars=_DIGITS,
     ),
     
     # IP Address (IPv4)
     PIIPattern(
         PIIType.IP_ADDRESS,
-        re.compile(r"\b(\d{1,3}\.\d{1,3}\.\d{1,3}\.\d{1,3})\b"),
+        re.compile(r"\b\d{1,3}+\.\d{1,3}+\.\d{1,3}+\.\d{1,3}+\b"),
         confidence=0.95,
         validator=lambda x: all(0 <= int(p) <= 255 for p in x.split(".")),
+        required_chars=_DIGITS,
     ),
     
     # MRN patterns (common formats)
     PIIPattern(
         PIIType.MRN,
-        re.compile(r"\b(MRN[-:\s]?\d{6,12})\b", re.IGNORECASE),
+        re.compile(r"\bMRN[-:\s]?+\d{6,12}+\b", re.IGNORECASE),
         confidence=0.90,
+        required_chars=_DIGITS,
     ),
     
     # Date patterns (MM/DD/YYYY, YYYY-MM-DD, etc.)
     PIIPattern(
         PIIType.DATE_OF_BIRTH,
-        re.compile(r"\b(\d{1,2}[/-]\d{1,2}[/-]\d{2,4})\b"),
+        re.compile(r"\b\d{1,2}+[/-]\d{1,2}+[/-]\d{2,4}+\b"),
         confidence=0.70,  # Lower confidence - dates are common
+        required_chars=_DIGITS,
     ),
     
     # ZIP+4
     PIIPattern(
         PIIType.ZIP_CODE,
-        re.compile(r"\b(\d{5}(?:-\d{4})?)\b"),
+        re.compile(r"\b\d{5}(?:-\d{4})?\b"),
         confidence=0.60,  # Low confidence - many 5-digit numbers exist
+        required_chars=_DIGITS,
     ),
-]
+)
 
 
 def _luhn_check(number: str) -> bool:
     """Validate number using Luhn algorithm."""
     if not number.isdigit():
         return False
-    digits = [int(d) for d in number]
-    odd_digits = digits[-1::-2]
-    even_digits = digits[-2::-2]
-    total = sum(odd_digits)
-    for d in even_digits:
-        total += sum(divmod(d * 2, 10))
-    return total % 10 == 0
+    return luhn_sum(number) % 10 == 0
 
 
 # =============================================================================
@@ -200,9 +243,12 @@ class PIIDetectionResult(BaseModel):
     matches: list[PIIMatch] = Field(default_factory=list)
     scan_timestamp: datetime = Field(default_factory=datetime.utcnow)
     
+    # Minimum confidence counted by high_confidence_matches
+    HIGH_CONFIDENCE: ClassVar[float] = 0.9
+    
     @property
     def has_pii(self) -> bool:
-        return len(self.matches) > 0
+        return bool(self.matches)
     
     @property
     def pii_types_found(self) -> set[PIIType]:
@@ -210,7 +256,20 @@ class PIIDetectionResult(BaseModel):
     
     @property
     def high_confidence_matches(self) -> list[PIIMatch]:
-        return [m for m in self.matches if m.confidence >= 0.9]
+        threshold = self.HIGH_CONFIDENCE
+        return [m for m in self.matches if m.confidence >= threshold]
+
+
+# Match found by the scanner: (start, end, confidence, pii_type, value)
+_RawMatch = tuple[int, int, float, PIIType, str]
+
+
+def _build_matches(raw: list[_RawMatch]) -> list[PIIMatch]:
+    """Build PIIMatch models from scanner tuples."""
+    return [
+        PIIMatch(pii_type=pii_type, value=value, start=start, end=end, confidence=confidence)
+        for start, end, confidence, pii_type, value in raw
+    ]
 
 
 # =============================================================================
@@ -229,12 +288,17 @@ class PIIDetector:
     - Custom pattern registration
     """
     
-    def __init__(self, patterns: list[PIIPattern] | None = None):
-        self.patterns = patterns or PII_PATTERNS.copy()
+    def __init__(self, patterns: Sequence[PIIPattern] | None = None):
+        # Defaults to the shared module-level tuple; add_pattern() copies
+        self.patterns: tuple[PIIPattern, ...] = tuple(patterns or PII_PATTERNS)
+        # scan_dict shortcuts that rely on what the built-in patterns can
+        # match (joining fields, skipping dates) are off for custom sets
+        self._builtin_patterns = self.patterns is PII_PATTERNS
     
     def add_pattern(self, pattern: PIIPattern) -> None:
         """Register a custom PII pattern."""
-        self.patterns.append(pattern)
+        self.patterns = (*self.patterns, pattern)
+        self._builtin_patterns = False
     
     def scan_text(self, text: str) -> PIIDetectionResult:
         """
@@ -246,11 +310,41 @@ class PIIDetector:
         Returns:
             PIIDetectionResult with all matches found
         """
-        matches: list[PIIMatch] = []
+        return PIIDetectionResult(
+            original_text=text,
+            matches=_build_matches(self._find_matches(text)),
+        )
+    
+    def _find_matches(self, text: str) -> list[_RawMatch]:
+        """
+        Run every pattern over the text and dedupe the matches.
+        
+        Matches stay plain tuples until after deduplication, so PIIMatch
+        models are only built for the ones that are kept.
+        """
+        matches: list[_RawMatch] = []
+        
+        # Most text holds no PII; rule patterns out with a cheap character
+        # check first. Non-ASCII text always gets the full scan, since \d
+        # also matches non-ASCII digits.
+        prefilter = text.isascii()
+        present: dict[str, bool] = {}
         
         for pii_pattern in self.patterns:
+            required = pii_pattern.required_chars
+            if prefilter and required:
+                found = present.get(required)
+                if found is None:
+                    found = present[required] = any(c in text for c in required)
+                if not found:
+                    continue
+            
+            # The built-in patterns match the value as a whole; custom
+            # patterns may capture it in their first group
+            group = 1 if pii_pattern.pattern.groups else 0
+            
             for match in pii_pattern.pattern.finditer(text):
-                value = match.group(1) if match.groups() else match.group(0)
+                value = match.group(group)
                 
                 # Apply validator if present
                 confidence = pii_pattern.confidence
@@ -261,21 +355,12 @@ class PIIDetector:
                     except Exception:
                         confidence *= 0.5
                 
-                matches.append(PIIMatch(
-                    pii_type=pii_pattern.pii_type,
-                    value=value,
-                    start=match.start(),
-                    end=match.end(),
-                    confidence=confidence,
-                ))
+                matches.append(
+                    (match.start(), match.end(), confidence, pii_pattern.pii_type, value)
+                )
         
         # Sort by position and remove overlapping matches (keep highest confidence)
-        matches = self._dedupe_overlapping(matches)
-        
-        return PIIDetectionResult(
-            original_text=text,
-            matches=matches,
-        )
+        return self._dedupe_overlapping(matches)
     
     def scan_dict(
         self,
@@ -292,50 +377,91 @@ class PIIDetector:
         Returns:
             Dict mapping field names to their PII matches
         """
-        results: dict[str, list[PIIMatch]] = {}
+        found: dict[str, list[PIIMatch]] = {}
         field_mapping = field_mapping or {}
         
+        # Values to scan, and where each one starts in the joined buffer
+        keys: list[str] = []
+        values: list[str] = []
+        starts: list[int] = []
+        offset = 0
+        builtin = self._builtin_patterns
+        
         for key, value in data.items():
             if value is None:
                 continue
             
-            str_value = str(value)
-            field_matches: list[PIIMatch] = []
+            if type(value) is str:
+                str_value = value
+            elif builtin and key not in field_mapping and type(value) in (bool, date, datetime):
+                # The text of a bool, date or datetime never matches a
+                # built-in pattern, so skip formatting and scanning it;
+                # subclasses such as pandas Timestamp may print nanoseconds
+                continue
+            else:
+                str_value = str(value)
             
             # Check if field is in known mapping
             if key in field_mapping:
-                field_matches.append(PIIMatch(
+                found[key] = [PIIMatch(
                     pii_type=field_mapping[key],
                     value=str_value,
                     start=0,
                     end=len(str_value),
                     confidence=1.0,  # Known field
-                ))
+                )]
             else:
-                # Scan field value for patterns
-                result = self.scan_text(str_value)
-                field_matches.extend(result.matches)
-            
-            if field_matches:
-                results[key] = field_matches
+                keys.append(key)
+                values.append(str_value)
+                starts.append(offset)
+                offset += len(str_value) + 1
+        
+        if builtin and not any(_FIELD_SEPARATOR in v for v in values):
+            # Scan all values in one pass; no built-in pattern can match
+            # across the separator, so each match falls inside one field
+            for start, end, confidence, pii_type, value in self._find_matches(
+                _FIELD_SEPARATOR.join(values)
+            ):
+                i = bisect_right(starts, start) - 1
+                found.setdefault(keys[i], []).append(PIIMatch(
+                    pii_type=pii_type,
+                    value=value,
+                    start=start - starts[i],
+                    end=end - starts[i],
+                    confidence=confidence,
+                ))
+        else:
+            for key, str_value in zip(keys, values, strict=True):
+                field_matches = self._find_matches(str_value)
+                if field_matches:
+                    found[key] = _build_matches(field_matches)
         
-        return results
+        # Results follow the field order of the input
+        return {key: found[key] for key in data if key in found}
     
-    def _dedupe_overlapping(self, matches: list[PIIMatch]) -> list[PIIMatch]:
+    def _dedupe_overlapping(self, matches: list[_RawMatch]) -> list[_RawMatch]:
         """Remove overlapping matches, keeping highest confidence."""
         if not matches:
             return []
         
         # Sort by start position, then by confidence (descending)
-        sorted_matches = sorted(matches, key=lambda m: (m.start, -m.confidence))
-        
-        result: list[PIIMatch] = []
+        if len(matches) < _NUMPY_SORT_MIN:
+            sorted_matches = sorted(matches, key=lambda m: (m[0], -m[2]))
+        else:
+            # lexsort is stable and sorts in C, without a key tuple per match
+            n = len(matches)
+            starts = np.fromiter((m[0] for m in matches), np.int64, n)
+            confidences = np.fromiter((m[2] for m in matches), np.float64, n)
+            order = np.lexsort((-confidences, starts))
+            sorted_matches = [matches[i] for i in order.tolist()]
+        
+        result: list[_RawMatch] = []
         last_end = -1
         
         for match in sorted_matches:
-            if match.start >= last_end:
+            if match[0] >= last_end:
                 result.append(match)
-                last_end = match.end
+                last_end = match[1]
         
         return result
 
@@ -356,6 +482,100 @@ class MaskingStrategy(str, Enum):
     CATEGORY = "category"   # Replace with category label
 
 
+def _partial_default(value: str) -> str:
+    """Show first and last char."""
+    if len(value) > 2:
+        return f"{value[0]}{'*' * (len(value) - 2)}{value[-1]}"
+    return "*" * len(value)
+
+
+def _partial_ssn(value: str) -> str:
+    """Show last 4: ***-**-1234"""
+    clean = _digits(value)
+    if len(clean) >= 4:
+        return f"***-**-{clean[-4:]}"
+    return _partial_default(value)
+
+
+def _partial_phone(value: str) -> str:
+    """Show last 4: (***) ***-1234"""
+    clean = _digits(value)
+    if len(clean) >= 4:
+        return f"(***) ***-{clean[-4:]}"
+    return _partial_default(value)
+
+
+def _partial_email(value: str) -> str:
+    """Show domain: a***@example.com"""
+    if "@" in value:
+        local, domain = value.split("@", 1)
+        return f"{local[0]}***@{domain}"
+    return _partial_default(value)
+
+
+def _partial_credit_card(value: str) -> str:
+    """Show last 4: ****-****-****-1234"""
+    clean = _digits(value)
+    if len(clean) >= 4:
+        return f"****-****-****-{clean[-4:]}"
+    return _partial_default(value)
+
+
+def _partial_name(value: str) -> str:
+    """Show initials: J*** D***"""
+    words = value.split()
+    return " ".join(f"{w[0]}***" if w else "***" for w in words)
+
+
+# PARTIAL masking per PII type; other types use _partial_default
+_PARTIAL_MASKS: dict[PIIType, Callable[[str], str]] = {
+    PIIType.SSN: _partial_ssn,
+    PIIType.PHONE: _partial_phone,
+    PIIType.EMAIL: _partial_email,
+    PIIType.CREDIT_CARD: _partial_credit_card,
+    PIIType.NAME: _partial_name,
+}
+
+
+@lru_cache(maxsize=64)
+def _blake2s_key(salt: str, pii_type: PIIType) -> bytes:
+    """Derive the BLAKE2s key for a salt and PII type."""
+    key = f"{salt}{pii_type.value}".encode()
+    if len(key) > 32:  # BLAKE2s key size limit
+        key = hashlib.blake2s(key).digest()
+    return key
+
+
+def _hash_value(value: str, pii_type: PIIType, salt: str, hash_algo: str) -> str:
+    """Hash a value to 16 hex characters with the given algorithm."""
+    if hash_algo == "blake2s":
+        key = _blake2s_key(salt, pii_type)
+        return hashlib.blake2s(value.encode(), digest_size=8, key=key).hexdigest()
+    
+    hash_input = f"{salt}{value}{pii_type.value}"
+    return hashlib.sha256(hash_input.encode()).hexdigest()[:16]
+
+
+def _mask_value(
+    value: str,
+    pii_type: PIIType,
+    strategy: MaskingStrategy,
+    salt: str,
+    hash_algo: str,
+) -> str:
+    """Apply a value-dependent masking strategy."""
+    if strategy == MaskingStrategy.ASTERISK:
+        return "*" * len(value)
+    
+    elif strategy == MaskingStrategy.HASH:
+        return _hash_value(value, pii_type, salt, hash_algo)
+    
+    elif strategy == MaskingStrategy.PARTIAL:
+        return _PARTIAL_MASKS.get(pii_type, _partial_default)(value)
+    
+    return value
+
+
 class PIIMasker:
     """
     Mask/redact PII from text and data structures.
@@ -365,16 +585,48 @@ class PIIMasker:
     - PARTIAL: Show partial data for usability
     - HASH: Consistent replacement for analytics
     - TOKEN: Reversible for authorized re-identification
+    
+    ``hash_algo`` selects the HASH digest: "sha256" (salted SHA-256, the
+    default) or "blake2s", a keyed BLAKE2s digest that is faster for short
+    values. Both yield 16 hex characters, but not the same ones, so keep
+    one algorithm for data that will be joined on hashed values.
+    
+    Masked values are memoized per masker, up to ``cache_size`` entries
+    (0 disables the cache), keyed on ``salt`` and ``hash_algo`` as well as
+    the value; ``cache_clear()`` releases the PII values they hold.
+    
+    TOKEN mappings are kept for the masker's lifetime unless ``max_tokens``
+    is set, in which case the least recently used ones are evicted: their
+    tokens can no longer be detokenized, and the value gets a new token
+    if it is seen again.
     """
     
+    HASH_ALGORITHMS = ("sha256", "blake2s")
+    
     def __init__(
         self,
         default_strategy: MaskingStrategy = MaskingStrategy.REDACT,
         salt: str = "",
+        hash_algo: str = "sha256",
+        cache_size: int = 65536,
+        max_tokens: int | None = None,
     ):
+        if hash_algo not in self.HASH_ALGORITHMS:
+            raise ValueError(
+                f"Unsupported hash algorithm: {hash_algo!r} "
+                f"(available: {', '.join(self.HASH_ALGORITHMS)})"
+            )
+        if max_tokens is not None and max_tokens < 1:
+            raise ValueError(f"max_tokens must be at least 1, got {max_tokens}")
+        
         self.default_strategy = default_strategy
         self.salt = salt
-        self._token_map: dict[str, str] = {}
+        self.hash_algo = hash_algo
+        # Masks other than TOKEN depend only on the arguments; the same
+        # phone numbers and ZIP codes recur across rows, so memoize them
+        self._mask_cached = lru_cache(maxsize=cache_size)(_mask_value)
+        self.max_tokens = max_tokens
+        self._token_map: dict[tuple[PIIType, str], str] = {}
         self._reverse_map: dict[str, str] = {}
     
     def mask_value(
@@ -396,26 +648,18 @@ class PIIMasker:
         """
         strategy = strategy or self.default_strategy
         
+        # Fixed labels are a table lookup, cheaper than the mask cache
         if strategy == MaskingStrategy.REDACT:
-            return f"[{pii_type.value.upper()}_REDACTED]"
-        
-        elif strategy == MaskingStrategy.ASTERISK:
-            return "*" * len(value)
-        
-        elif strategy == MaskingStrategy.HASH:
-            hash_input = f"{self.salt}{value}{pii_type.value}"
-            return hashlib.sha256(hash_input.encode()).hexdigest()[:16]
-        
-        elif strategy == MaskingStrategy.PARTIAL:
-            return self._partial_mask(value, pii_type)
-        
-        elif strategy == MaskingStrategy.TOKEN:
+            return _REDACT_LABELS[pii_type]
+        if strategy == MaskingStrategy.CATEGORY:
+            return _CATEGORY_LABELS[pii_type]
+        if strategy == MaskingStrategy.TOKEN:
             return self._tokenize(value, pii_type)
-        
-        elif strategy == MaskingStrategy.CATEGORY:
-            return f"[{pii_type.value.upper()}]"
-        
-        return value
+        return self._mask_cached(value, pii_type, strategy, self.salt, self.hash_algo)
+    
+    def cache_clear(self) -> None:
+        """Drop memoized masks, e.g. to release the PII values they hold."""
+        self._mask_cached.cache_clear()
     
     def mask_text(
         self,
@@ -437,15 +681,19 @@ class PIIMasker:
         if not matches:
             return text
         
-        # Sort matches by position (reverse) for safe replacement
-        sorted_matches = sorted(matches, key=lambda m: m.start, reverse=True)
-        
-        result = text
-        for match in sorted_matches:
-            masked = self.mask_value(match.value, match.pii_type, strategy)
-            result = result[:match.start] + masked + result[match.end:]
+        # Assemble the output in one forward pass instead of re-slicing
+        # the whole text for every match
+        parts: list[str] = []
+        cursor = 0
+        for match in sorted(matches, key=attrgetter("start")):
+            if match.start < cursor:
+                continue  # Overlaps a match that is already masked
+            parts.append(text[cursor:match.start])
+            parts.append(self.mask_value(match.value, match.pii_type, strategy))
+            cursor = match.end
+        parts.append(text[cursor:])
         
-        return result
+        return "".join(parts)
     
     def mask_dict(
         self,
@@ -474,51 +722,33 @@ class PIIMasker:
     
     def _partial_mask(self, value: str, pii_type: PIIType) -> str:
         """Apply partial masking based on PII type."""
-        if pii_type == PIIType.SSN:
-            # Show last 4: ***-**-1234
-            clean = re.sub(r"\D", "", value)
-            if len(clean) >= 4:
-                return f"***-**-{clean[-4:]}"
-        
-        elif pii_type == PIIType.PHONE:
-            # Show last 4: (***) ***-1234
-            clean = re.sub(r"\D", "", value)
-            if len(clean) >= 4:
-                return f"(***) ***-{clean[-4:]}"
-        
-        elif pii_type == PIIType.EMAIL:
-            # Show domain: a***@example.com
-            if "@" in value:
-                local, domain = value.split("@", 1)
-                return f"{local[0]}***@{domain}"
-        
-        elif pii_type == PIIType.CREDIT_CARD:
-            # Show last 4: ****-****-****-1234
-            clean = re.sub(r"\D", "", value)
-            if len(clean) >= 4:
-                return f"****-****-****-{clean[-4:]}"
-        
-        elif pii_type == PIIType.NAME:
-            # Show initials: J*** D***
-            words = value.split()
-            return " ".join(f"{w[0]}***" if w else "***" for w in words)
-        
-        # Default: show first and last char
-        if len(value) > 2:
-            return f"{value[0]}{'*' * (len(value) - 2)}{value[-1]}"
-        return "*" * len(value)
+        return _PARTIAL_MASKS.get(pii_type, _partial_default)(value)
     
     def _tokenize(self, value: str, pii_type: PIIType) -> str:
         """Create reversible token for value."""
-        key = f"{pii_type.value}:{value}"
-        
-        if key not in self._token_map:
-            import uuid
-            token = f"TOK_{pii_type.value.upper()}_{uuid.uuid4().hex[:8]}"
-            self._token_map[key] = token
-            self._reverse_map[token] = value
-        
-        return self._token_map[key]
+        key = (pii_type, value)
+        token_map = self._token_map
+        
+        token = token_map.get(key)
+        if token is not None:
+            if self.max_tokens is not None:
+                # Re-insert to mark as most recently used
+                del token_map[key]
+                token_map[key] = token
+            return token
+        
+        token = f"{_TOKEN_PREFIXES[pii_type]}{secrets.token_hex(4)}"
+        while token in self._reverse_map:  # 32-bit suffixes can collide
+            token = f"{_TOKEN_PREFIXES[pii_type]}{secrets.token_hex(4)}"
+        
+        if self.max_tokens is not None and len(token_map) >= self.max_tokens:
+            # Dicts keep insertion order, so the first key is the oldest
+            oldest = next(iter(token_map))
+            del self._reverse_map[token_map.pop(oldest)]
+        
+        token_map[key] = token
+        self._reverse_map[token] = value
+        return token
     
     def detokenize(self, token: str) -> str | None:
         """Reverse a token to original value (if available)."""
@@ -544,6 +774,18 @@ class SafeHarborDeidentifier:
     # For simplicity, we generalize all ZIPs to 3 digits
     ZIP_GENERALIZE_DIGITS = 3
     
+    # Identifiers removed outright: names (1), street address and city (2),
+    # contact info (4-6), SSN (7), MRN (8) and other identifiers (9-14)
+    REDACT_FIELDS: frozenset[str] = frozenset({
+        "first_name", "last_name", "middle_name", "full_name",
+        "address_line1", "address_line2", "city",
+        "phone", "fax", "email",
+        "ssn",
+        "mrn",
+        "health_plan_id", "account_number", "license_number",
+        "vehicle_id", "device_serial", "url", "ip_address",
+    })
+    
     def __init__(self):
         self.detector = PIIDetector()
         self.masker = PIIMasker(default_strategy=MaskingStrategy.REDACT)
@@ -554,68 +796,56 @@ class SafeHarborDeidentifier:
         
         Removes or generalizes all 18 HIPAA identifiers.
         """
-        result = patient_data.copy()
-        
-        # 1. Remove names
-        for field in ["first_name", "last_name", "middle_name", "full_name"]:
-            if field in result:
-                result[field] = "[REDACTED]"
-        
-        # 2. Generalize geographic data
-        if "zip_code" in result and result["zip_code"]:
-            zip_clean = re.sub(r"\D", "", str(result["zip_code"]))
-            if len(zip_clean) >= 3:
-                result["zip_code"] = zip_clean[:self.ZIP_GENERALIZE_DIGITS] + "00"
-            else:
-                result["zip_code"] = "00000"
-        
-        for field in ["address_line1", "address_line2", "city"]:
-            if field in result:
-                result[field] = "[REDACTED]"
-        
-        # 3. Generalize dates to year only (except for age > 90)
-        if "date_of_birth" in result and result["date_of_birth"]:
-            dob = result["date_of_birth"]
-            if isinstance(dob, str):
-                try:
-                    dob = datetime.fromisoformat(dob).date()
-                except ValueError:
-                    dob = None
-            
-            if isinstance(dob, (date, datetime)):
-                age = self._calculate_age(dob)
-                if age >= self.AGE_THRESHOLD:
-                    # For 90+, replace with "90+"
-                    result["date_of_birth"] = None
-                    result["age_category"] = "90+"
-                else:
-                    # Keep only year
-                    result["date_of_birth"] = dob.year if hasattr(dob, 'year') else None
-        
-        # 4-6. Remove contact info
-        for field in ["phone", "fax", "email"]:
-            if field in result:
-                result[field] = "[REDACTED]"
-        
-        # 7. Remove SSN
-        if "ssn" in result:
-            result["ssn"] = "[REDACTED]"
-        
-        # 8. Remove MRN
-        if "mrn" in result:
-            result["mrn"] = "[REDACTED]"
-        
-        # 9-14. Remove other identifiers
-        id_fields = [
-            "health_plan_id", "account_number", "license_number",
-            "vehicle_id", "device_serial", "url", "ip_address",
-        ]
-        for field in id_fields:
-            if field in result:
-                result[field] = "[REDACTED]"
+        result: dict[str, Any] = {}
+        age_category: str | None = None
+        
+        # One pass over the record's own keys instead of probing for
+        # every identifier field
+        for field, value in patient_data.items():
+            if field in self.REDACT_FIELDS:
+                value = "[REDACTED]"
+            elif field == "zip_code":
+                if value:
+                    value = self._generalize_zip(value)
+            elif field == "date_of_birth":
+                if value:
+                    value, age_category = self._generalize_dob(value)
+            result[field] = value
+        
+        if age_category is not None:
+            result["age_category"] = age_category
         
         return result
     
+    def _generalize_zip(self, zip_code: Any) -> str:
+        """Truncate a ZIP code to its 3-digit prefix."""
+        zip_clean = _digits(str(zip_code))
+        if len(zip_clean) >= 3:
+            return zip_clean[:self.ZIP_GENERALIZE_DIGITS] + "00"
+        return "00000"
+    
+    def _generalize_dob(self, dob: Any) -> tuple[Any, str | None]:
+        """
+        Generalize a date of birth to its year.
+        
+        Returns the new value and, for ages at or over the threshold, the
+        age category that replaces it. Unparseable values pass through.
+        """
+        if isinstance(dob, str):
+            try:
+                dob = datetime.fromisoformat(dob).date()
+            except ValueError:
+                return dob, None
+        
+        if not isinstance(dob, (date, datetime)):
+            return dob, None
+        
+        if self._calculate_age(dob) >= self.AGE_THRESHOLD:
+            # For 90+, replace with "90+"
+            return None, "90+"
+        # Keep only year
+        return dob.year, None
+    
     def _calculate_age(self, dob: date) -> int:
         """Calculate age from date of birth."""
         today = date.today()
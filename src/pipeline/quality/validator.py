@@ -8,12 +8,17 @@ Supports schema validation, business rules, statistical checks, and quality scor
 from __future__ import annotations
 
 import re
+import time
 from abc import ABC, abstractmethod
 from dataclasses import dataclass, field
 from datetime import datetime
 from enum import Enum
-from typing import Any, Callable, Generic, TypeVar
+from functools import lru_cache
+from itertools import chain
+from typing import Any, Callable, Generic, TypeVar, cast
 
+import numpy as np
+import pandas as pd
 from pydantic import BaseModel, Field
 
 T = TypeVar("T")
@@ -46,6 +51,12 @@ class QualityDimension(str, Enum):
 # =============================================================================
 
 
+@lru_cache(maxsize=512)
+def _compile_pattern(pattern: str) -> re.Pattern[str]:
+    """Compile a rule pattern once, shared by every rule that uses it."""
+    return re.compile(pattern)
+
+
 @dataclass
 class ValidationRule(ABC):
     """Base class for validation rules."""
@@ -115,7 +126,7 @@ class RegexRule(ValidationRule):
     dimension: QualityDimension = QualityDimension.VALIDITY
     
     def __post_init__(self) -> None:
-        self._compiled = re.compile(self.pattern) if self.pattern else None
+        self._compiled = _compile_pattern(self.pattern) if self.pattern else None
     
     def validate(self, value: Any, context: dict[str, Any] | None = None) -> bool:
         if value is None:
@@ -133,15 +144,30 @@ class EnumRule(ValidationRule):
     case_sensitive: bool = True
     dimension: QualityDimension = QualityDimension.VALIDITY
     
+    def __post_init__(self) -> None:
+        # Membership set built once; None when allowed values are unhashable
+        self._allowed: frozenset[Any] | None
+        if self.case_sensitive:
+            try:
+                self._allowed = frozenset(self.allowed_values)
+            except TypeError:
+                self._allowed = None
+        else:
+            self._allowed = frozenset(str(v).lower() for v in self.allowed_values)
+    
     def validate(self, value: Any, context: dict[str, Any] | None = None) -> bool:
         if value is None:
             return True
         
         if self.case_sensitive:
+            if self._allowed is not None:
+                try:
+                    return value in self._allowed
+                except TypeError:  # unhashable value
+                    pass
             return value in self.allowed_values
         else:
-            value_lower = str(value).lower()
-            return value_lower in [str(v).lower() for v in self.allowed_values]
+            return str(value).lower() in self._allowed  # type: ignore[operator]
 
 
 @dataclass
@@ -204,6 +230,219 @@ class CustomRule(ValidationRule):
         return self.validator(value, context)
 
 
+# =============================================================================
+# COLUMN KERNELS
+# =============================================================================
+
+# A kernel evaluates one rule over a whole column and returns the per-row
+# validity mask, or None when the column needs the per-value fallback.
+# Missing cells (None/NaN/NaT) are passed in ``null`` and read as None.
+_ColumnKernel = Callable[[Any, pd.Series, list[Any], np.ndarray], "np.ndarray | None"]
+
+
+def _column_values(series: pd.Series) -> tuple[list[Any], np.ndarray]:
+    """Python values of a column, with missing cells replaced by None."""
+    null = series.isna().to_numpy(dtype=bool)
+    values = series.tolist()
+    if null.any():
+        for i in np.flatnonzero(null).tolist():
+            values[i] = None
+    return values, null
+
+
+def _datetime_column(series: pd.Series) -> tuple[np.ndarray, np.ndarray] | None:
+    """
+    Read a column of naive datetimes or ISO strings as row rules would.
+    
+    Strings go through datetime.fromisoformat once per distinct value.
+    Returns (datetime64 values with NaT for nulls, parsed Python values),
+    or None for anything else (empty, unparseable or tz-aware values).
+    """
+    values, null = _column_values(series)
+    if pd.api.types.is_datetime64_dtype(series.dtype):
+        return series.to_numpy(), np.array(values, dtype=object)
+    try:
+        codes, uniques = pd.factorize(np.array(values, dtype=object))
+    except TypeError:
+        return None
+    parsed: list[Any] = []
+    for value in uniques:
+        if isinstance(value, str) and value:
+            try:
+                value = datetime.fromisoformat(value)
+            except ValueError:
+                return None
+        if not isinstance(value, datetime) or value.tzinfo is not None:
+            return None
+        parsed.append(value)
+    parsed.append(None)  # picked up by the -1 code of null cells
+    stamps = np.array(parsed[:-1] + [np.datetime64("NaT")], dtype="datetime64[us]")
+    return stamps[codes], np.array(parsed, dtype=object)[codes]
+
+
+def _not_null_kernel(
+    rule: NotNullRule, series: pd.Series, values: list[Any], null: np.ndarray,
+) -> np.ndarray:
+    return ~null
+
+
+def _not_empty_kernel(
+    rule: NotEmptyRule, series: pd.Series, values: list[Any], null: np.ndarray,
+) -> np.ndarray:
+    dtype = series.dtype
+    if pd.api.types.is_numeric_dtype(dtype) or pd.api.types.is_datetime64_any_dtype(dtype):
+        return ~null
+    blank = np.fromiter(
+        (isinstance(v, str) and not v.strip() for v in values),
+        dtype=bool,
+        count=len(values),
+    )
+    return np.asarray(~(null | blank), dtype=bool)
+
+
+def _range_kernel(
+    rule: RangeRule, series: pd.Series, values: list[Any], null: np.ndarray,
+) -> np.ndarray | None:
+    if pd.api.types.is_numeric_dtype(series.dtype):
+        nums = series.to_numpy(dtype=np.float64, na_value=np.nan)
+    else:
+        # NumPy's object -> float64 cast calls float() per value, as validate()
+        # does; any value float() rejects sends the column to the fallback
+        cells = np.array(values, dtype=object)
+        cells[null] = np.nan
+        try:
+            nums = cells.astype(np.float64)
+        except (TypeError, ValueError):
+            return None
+    valid = np.ones(len(nums), dtype=bool)
+    if rule.min_value is not None:
+        valid &= ~(nums < rule.min_value)
+    if rule.max_value is not None:
+        valid &= ~(nums > rule.max_value)
+    return np.asarray(valid | null, dtype=bool)
+
+
+def _regex_kernel(
+    rule: RegexRule, series: pd.Series, values: list[Any], null: np.ndarray,
+) -> np.ndarray:
+    if rule._compiled is None:
+        return np.ones(len(values), dtype=bool)
+    match = rule._compiled.match
+    return np.fromiter(
+        (v is None or match(v if type(v) is str else str(v)) is not None for v in values),
+        dtype=bool,
+        count=len(values),
+    )
+
+
+def _enum_kernel(
+    rule: EnumRule, series: pd.Series, values: list[Any], null: np.ndarray,
+) -> np.ndarray | None:
+    allowed = rule._allowed
+    if allowed is None:
+        return None
+    keys: Any = values if rule.case_sensitive else (str(v).lower() for v in values)
+    try:
+        member = np.fromiter((k in allowed for k in keys), dtype=bool, count=len(values))
+    except TypeError:  # unhashable value
+        return None
+    return np.asarray(member | null, dtype=bool)
+
+
+def _unique_kernel(
+    rule: UniqueRule, series: pd.Series, values: list[Any], null: np.ndarray,
+) -> np.ndarray | None:
+    present = ~null
+    try:
+        seen = pd.Series(values, dtype=object)[present]
+        duplicate = seen.duplicated(keep="first").to_numpy(dtype=bool)
+        rule._seen_values.update(seen.tolist())
+    except TypeError:
+        return None
+    valid = np.ones(len(values), dtype=bool)
+    valid[present] = ~duplicate
+    return valid
+
+
+def _date_range_kernel(
+    rule: DateRangeRule, series: pd.Series, values: list[Any], null: np.ndarray,
+) -> np.ndarray | None:
+    if not pd.api.types.is_datetime64_dtype(series.dtype):
+        # Text/mixed columns: validate() is pure, so parse and check each
+        # distinct value once (dates repeat heavily) and broadcast back
+        try:
+            codes, uniques = pd.factorize(np.array(values, dtype=object))
+        except TypeError:
+            return None
+        # Trailing True is picked up by the -1 code of null cells
+        checked = np.fromiter(
+            (*(rule.validate(u) for u in uniques), True), dtype=bool, count=len(uniques) + 1,
+        )
+        return np.asarray(checked[codes], dtype=bool)
+    valid = np.ones(len(values), dtype=bool)
+    if rule.min_date:
+        valid &= ~(series < rule.min_date).to_numpy(dtype=bool)
+    if rule.max_date:
+        valid &= ~(series > rule.max_date).to_numpy(dtype=bool)
+    return np.asarray(valid | null, dtype=bool)
+
+
+# Keyed by exact rule type: subclasses that override validate() fall back
+_COLUMN_KERNELS: dict[type, _ColumnKernel] = {
+    NotNullRule: _not_null_kernel,
+    NotEmptyRule: _not_empty_kernel,
+    RangeRule: _range_kernel,
+    RegexRule: _regex_kernel,
+    EnumRule: _enum_kernel,
+    UniqueRule: _unique_kernel,
+    DateRangeRule: _date_range_kernel,
+}
+
+
+# Outcome of each built-in rule on a None value, so the per-record path can
+# settle null cells without calling validate()
+_NULL_OUTCOMES: dict[type, bool] = {
+    NotNullRule: False,
+    NotEmptyRule: False,
+    RangeRule: True,
+    RegexRule: True,
+    EnumRule: True,
+    UniqueRule: True,
+    DateRangeRule: True,
+}
+
+
+
+def _present_check(rule: ValidationRule) -> Callable[[Any, dict[str, Any] | None], bool]:
+    """Return a rule's check specialized for non-None values."""
+    if type(rule) is RegexRule and rule._compiled is not None:
+        match = rule._compiled.match
+        return lambda value, context: match(str(value)) is not None
+    if type(rule) is NotEmptyRule:
+        return lambda value, context: not isinstance(value, str) or bool(value.strip())
+    if type(rule) is UniqueRule:
+        seen = rule._seen_values
+        
+        def check_unique(value: Any, context: dict[str, Any] | None) -> bool:
+            if value in seen:
+                return False
+            seen.add(value)
+            return True
+        
+        return check_unique
+    return rule.validate
+
+
+# Column-wise form of a row rule for validate_dataframe (see add_row_rule)
+_FrameRule = Callable[[pd.DataFrame], "list[QualityIssue] | None"]
+
+# (rule, bound validate or None when the outcome is fixed)
+_RuleCheck = tuple[ValidationRule, "Callable[[Any, dict[str, Any] | None], bool] | None"]
+
+# Per-field (present-value checks, None-value checks)
+_RulePlan = list[tuple[str, list[_RuleCheck], list[_RuleCheck]]]
+
+
 # =============================================================================
 # VALIDATION RESULTS
 # =============================================================================
@@ -261,6 +500,9 @@ class DataQualityReport(BaseModel):
     field_reports: dict[str, FieldQualityReport] = Field(default_factory=dict)
     issues: list[QualityIssue] = Field(default_factory=list)
     
+    # Issues counted but not kept, by severity (see max_issues_per_rule)
+    suppressed_issues: dict[str, int] = Field(default_factory=dict)
+    
     # Dimension scores
     dimension_scores: dict[str, float] = Field(default_factory=dict)
     
@@ -278,15 +520,17 @@ class DataQualityReport(BaseModel):
     @property
     def has_errors(self) -> bool:
         """Check if any error-level issues exist."""
-        return any(i.severity == Severity.ERROR for i in self.issues)
+        return self.error_count > 0
     
     @property
     def error_count(self) -> int:
-        return sum(1 for i in self.issues if i.severity == Severity.ERROR)
+        kept = sum(1 for i in self.issues if i.severity == Severity.ERROR)
+        return kept + self.suppressed_issues.get(Severity.ERROR.value, 0)
     
     @property
     def warning_count(self) -> int:
-        return sum(1 for i in self.issues if i.severity == Severity.WARNING)
+        kept = sum(1 for i in self.issues if i.severity == Severity.WARNING)
+        return kept + self.suppressed_issues.get(Severity.WARNING.value, 0)
 
 
 # =============================================================================
@@ -294,6 +538,28 @@ class DataQualityReport(BaseModel):
 # =============================================================================
 
 
+class _IssueSampler:
+    """Admit the first ``limit`` issues per (field, rule); tally the rest by severity."""
+    
+    def __init__(self, limit: int | None) -> None:
+        self.limit = limit
+        self.counts: dict[tuple[str, str], int] = {}
+        self.suppressed: dict[str, int] = {}
+    
+    def admit(self, field: str, rule_name: str, severity: Any) -> bool:
+        """Count one issue and report whether it should be materialized."""
+        if self.limit is None:
+            return True
+        key = (field, rule_name)
+        seen = self.counts.get(key, 0)
+        self.counts[key] = seen + 1
+        if seen < self.limit:
+            return True
+        level = Severity(severity).value
+        self.suppressed[level] = self.suppressed.get(level, 0) + 1
+        return False
+
+
 class DataQualityValidator:
     """
     Validate data quality against defined rules.
@@ -309,6 +575,10 @@ class DataQualityValidator:
         self.dataset_name = dataset_name
         self.field_rules: dict[str, list[ValidationRule]] = {}
         self.row_rules: list[Callable[[dict[str, Any]], list[QualityIssue]]] = []
+        self.frame_rules: dict[Callable[..., Any], _FrameRule] = {}
+        # Compiled field rules, and the rule identities they were built from
+        self._rule_plan: _RulePlan = []
+        self._rule_plan_key: list[Any] | None = None
     
     def add_field_rule(self, field: str, rule: ValidationRule) -> "DataQualityValidator":
         """Add a validation rule for a field."""
@@ -320,11 +590,58 @@ class DataQualityValidator:
     def add_row_rule(
         self,
         rule: Callable[[dict[str, Any]], list[QualityIssue]],
+        frame_rule: _FrameRule | None = None,
     ) -> "DataQualityValidator":
-        """Add a cross-field validation rule."""
+        """
+        Add a cross-field validation rule.
+        
+        ``frame_rule`` optionally gives validate_dataframe a column-wise
+        equivalent: it returns the issues ``rule`` would raise across the
+        frame, in row order with row_index set, or None to fall back to
+        calling ``rule`` per row.
+        """
         self.row_rules.append(rule)
+        if frame_rule is not None:
+            self.frame_rules[rule] = frame_rule
         return self
     
+    def _compile_rules(self) -> _RulePlan:
+        """
+        Resolve field rules into per-field check lists for the record path.
+        
+        Each field gets one list for present values and one for None.
+        Built-in rules whose outcome is fixed are dropped (always pass) or
+        kept without a callable (always fail), so e.g. a NotNullRule costs
+        nothing on present values. The plan is reused until ``field_rules``
+        holds different rule objects (the plan keeps the old ones alive, so
+        their ids cannot be recycled).
+        """
+        field_rules = self.field_rules
+        key = [
+            *field_rules,
+            *map(len, field_rules.values()),
+            *map(id, chain.from_iterable(field_rules.values())),
+        ]
+        if key == self._rule_plan_key:
+            return self._rule_plan
+        
+        plan: _RulePlan = []
+        for field_name, rules in field_rules.items():
+            checks: list[_RuleCheck] = []
+            null_checks: list[_RuleCheck] = []
+            for rule in rules:
+                null_outcome = _NULL_OUTCOMES.get(type(rule))
+                if type(rule) is not NotNullRule:
+                    checks.append((rule, _present_check(rule)))
+                if null_outcome is None:
+                    null_checks.append((rule, rule.validate))
+                elif not null_outcome:
+                    null_checks.append((rule, None))
+            plan.append((field_name, checks, null_checks))
+        self._rule_plan = plan
+        self._rule_plan_key = key
+        return plan
+    
     def validate_record(
         self,
         record: dict[str, Any],
@@ -332,13 +649,14 @@ class DataQualityValidator:
     ) -> list[QualityIssue]:
         """Validate a single record."""
         issues: list[QualityIssue] = []
+        plan = self._compile_rules()
         
         # Field-level validation
-        for field_name, rules in self.field_rules.items():
+        for field_name, checks, null_checks in plan:
             value = record.get(field_name)
             
-            for rule in rules:
-                if not rule.validate(value, record):
+            for rule, validate in null_checks if value is None else checks:
+                if validate is None or not validate(value, record):
                     issues.append(QualityIssue(
                         field=field_name,
                         rule_name=rule.name,
@@ -361,58 +679,89 @@ class DataQualityValidator:
     def validate_batch(
         self,
         records: list[dict[str, Any]],
+        max_issues_per_rule: int | None = None,
     ) -> DataQualityReport:
-        """Validate a batch of records."""
-        import time
+        """
+        Validate a batch of records.
+        
+        With ``max_issues_per_rule`` set, only the first that many issues of
+        each (field, rule) pair are kept in the report; counts and scores
+        still cover every failure, and the rest are tallied by severity in
+        ``suppressed_issues``.
+        """
         start_time = time.time()
         
         all_issues: list[QualityIssue] = []
         valid_count = 0
         invalid_count = 0
+        sampler = _IssueSampler(max_issues_per_rule)
+        validity_rows = 0
+        uniqueness_count = 0
         
-        # Initialize field reports
-        field_reports: dict[str, FieldQualityReport] = {}
-        for field in self.field_rules:
-            field_reports[field] = FieldQualityReport(
-                field=field,
-                total_records=len(records),
-            )
+        # Per-field tallies, copied into the field reports at the end
+        fields = list(self.field_rules)
+        null_counts = dict.fromkeys(fields, 0)
+        invalid_counts = dict.fromkeys(fields, 0)
+        field_issues: dict[str, list[QualityIssue]] = {field: [] for field in fields}
         
         # Reset unique rules
         for rules in self.field_rules.values():
             for rule in rules:
                 if isinstance(rule, UniqueRule):
                     rule.reset()
+        plan = self._compile_rules()
+        error = Severity.ERROR
+        validity = QualityDimension.VALIDITY
+        uniqueness = QualityDimension.UNIQUENESS
         
         # Validate each record
         for idx, record in enumerate(records):
-            record_issues = self.validate_record(record, idx)
+            failures = self._record_failures(record, idx, plan, sampler)
+            
+            for field in fields:
+                if record.get(field) is None:
+                    null_counts[field] += 1
             
-            if any(i.severity == Severity.ERROR for i in record_issues):
+            row_has_error = False
+            row_has_validity = False
+            failed_fields: set[str] = set()
+            for field, dimension, severity, issue in failures:
+                if severity == error:
+                    row_has_error = True
+                if dimension == validity:
+                    row_has_validity = True
+                elif dimension == uniqueness:
+                    uniqueness_count += 1
+                if issue is not None:
+                    all_issues.append(issue)
+                if field in field_issues and record.get(field) is not None:
+                    failed_fields.add(field)
+                    if issue is not None:
+                        field_issues[field].append(issue)
+            validity_rows += row_has_validity
+            for field in failed_fields:
+                invalid_counts[field] += 1
+            
+            if row_has_error:
                 invalid_count += 1
             else:
                 valid_count += 1
-            
-            # Update field reports
-            for field in self.field_rules:
-                value = record.get(field)
-                report = field_reports[field]
-                
-                if value is None:
-                    report.null_count += 1
-                else:
-                    field_issues = [i for i in record_issues if i.field == field]
-                    if field_issues:
-                        report.invalid_count += 1
-                        report.issues.extend(field_issues)
-                    else:
-                        report.valid_count += 1
-            
-            all_issues.extend(record_issues)
+        
+        field_reports = {
+            field: FieldQualityReport(
+                field=field,
+                total_records=len(records),
+                null_count=null_counts[field],
+                valid_count=len(records) - null_counts[field] - invalid_counts[field],
+                invalid_count=invalid_counts[field],
+                issues=field_issues[field],
+            )
+            for field in fields
+        }
         
         # Calculate dimension scores
         dimension_scores = self._calculate_dimension_scores(
-            records, field_reports, all_issues
+            len(records), field_reports, validity_rows, uniqueness_count
         )
         
         duration_ms = int((time.time() - start_time) * 1000)
@@ -424,15 +773,232 @@ class DataQualityValidator:
             invalid_records=invalid_count,
             field_reports=field_reports,
             issues=all_issues,
+            suppressed_issues=sampler.suppressed,
+            dimension_scores=dimension_scores,
+            duration_ms=duration_ms,
+        )
+    
+    def _record_failures(
+        self,
+        record: dict[str, Any],
+        row_index: int,
+        plan: _RulePlan,
+        sampler: _IssueSampler,
+    ) -> list[tuple[str, Any, Any, QualityIssue | None]]:
+        """
+        Evaluate one record for validate_batch.
+        
+        Returns (field, dimension, severity, issue) per failure in
+        validate_record order, with issue None when the sampler drops it.
+        """
+        failures: list[tuple[str, Any, Any, QualityIssue | None]] = []
+        
+        for field_name, checks, null_checks in plan:
+            value = record.get(field_name)
+            
+            for rule, validate in null_checks if value is None else checks:
+                if validate is None or not validate(value, record):
+                    issue = None
+                    if sampler.admit(field_name, rule.name, rule.severity):
+                        issue = QualityIssue(
+                            field=field_name,
+                            rule_name=rule.name,
+                            dimension=rule.dimension,
+                            severity=rule.severity,
+                            message=f"{rule.description}: {rule.name} failed",
+                            value=value,
+                            row_index=row_index,
+                        )
+                    failures.append((field_name, rule.dimension, rule.severity, issue))
+        
+        for row_rule in self.row_rules:
+            for issue in row_rule(record):
+                issue.row_index = row_index
+                kept = sampler.admit(issue.field, issue.rule_name, issue.severity)
+                failures.append(
+                    (issue.field, issue.dimension, issue.severity, issue if kept else None)
+                )
+        
+        return failures
+    
+    def validate_dataframe(
+        self,
+        df: pd.DataFrame,
+        max_issues_per_rule: int | None = None,
+    ) -> DataQualityReport:
+        """
+        Validate a DataFrame column by column.
+
+        Produces the same report as ``validate_batch`` on the equivalent
+        records, reading missing cells (None/NaN/NaT) as None. Built-in
+        rules run once per column; other rules and row rules fall back to
+        per-row calls, and issues are only built for failing rows.
+        """
+        start_time = time.time()
+        n = len(df)
+        fields = list(self.field_rules)
+        records: list[dict[str, Any]] | None = None
+        
+        def get_records() -> list[dict[str, Any]]:
+            # Row dicts for fallback and row rules, assembled from column
+            # lists (much cheaper than DataFrame.to_dict)
+            nonlocal records
+            if records is None:
+                names = list(df.columns)
+                cells = [_column_values(df.iloc[:, i])[0] for i in range(len(names))]
+                records = [dict(zip(names, row, strict=True)) for row in zip(*cells, strict=True)]
+                if not names:
+                    records = [{} for _ in range(n)]
+            return records
+        
+        # Failing rows per (field, rule), then per row rule
+        columns: list[tuple[list[Any], np.ndarray]] = []
+        fail_rows: list[np.ndarray] = []
+        fail_keys: list[tuple[int, ValidationRule]] = []
+        for pos, field_name in enumerate(fields):
+            if field_name in df.columns:
+                series = df[field_name]
+            else:
+                series = pd.Series([None] * n, index=df.index, dtype=object)
+            values, null = _column_values(series)
+            columns.append((values, null))
+            
+            for rule in self.field_rules[field_name]:
+                if isinstance(rule, UniqueRule):
+                    rule.reset()
+                kernel = _COLUMN_KERNELS.get(type(rule))
+                valid = kernel(rule, series, values, null) if kernel is not None else None
+                if valid is None:
+                    valid = np.fromiter(
+                        (rule.validate(v, r) for v, r in zip(values, get_records(), strict=True)),
+                        dtype=bool,
+                        count=n,
+                    )
+                fail_rows.append(np.flatnonzero(~valid))
+                fail_keys.append((pos, rule))
+        
+        # (row, rule position, issue); the stable sort keeps each rule's order
+        row_issues: list[tuple[int, int, QualityIssue]] = []
+        per_row_rules: list[tuple[int, Callable[[dict[str, Any]], list[QualityIssue]]]] = []
+        for rule_pos, row_rule in enumerate(self.row_rules):
+            frame_rule = self.frame_rules.get(row_rule)
+            frame_issues = frame_rule(df) if frame_rule is not None else None
+            if frame_issues is None:
+                per_row_rules.append((rule_pos, row_rule))
+            else:
+                row_issues.extend((cast(int, i.row_index), rule_pos, i) for i in frame_issues)
+        if per_row_rules:
+            for idx, record in enumerate(get_records()):
+                for rule_pos, row_rule in per_row_rules:
+                    for issue in row_rule(record):
+                        issue.row_index = idx
+                        row_issues.append((idx, rule_pos, issue))
+        row_issues.sort(key=lambda entry: (entry[0], entry[1]))
+        
+        # Restore validate_batch order: by row, then field and rule order,
+        # with row rule issues last
+        row_rule_rows = np.array([idx for idx, _, _ in row_issues], dtype=np.intp)
+        rows = np.concatenate(fail_rows + [row_rule_rows])
+        sources = np.concatenate(
+            [np.full(len(r), k, dtype=np.intp) for k, r in enumerate(fail_rows)]
+            + [np.full(len(row_issues), len(fail_rows), dtype=np.intp)]
+        )
+        offsets = np.concatenate(
+            [np.arange(len(r), dtype=np.intp) for r in fail_rows]
+            + [np.arange(len(row_issues), dtype=np.intp)]
+        )
+        order = np.lexsort((offsets, sources, rows))
+        
+        all_issues: list[QualityIssue] = []
+        failures_by_field: dict[str, list[tuple[int, QualityIssue | None]]] = {}
+        sampler = _IssueSampler(max_issues_per_rule)
+        row_rule_source = len(fail_rows)
+        for row, source, offset in zip(
+            rows[order].tolist(), sources[order].tolist(), offsets[order].tolist(), strict=True
+        ):
+            kept: QualityIssue | None
+            if source == row_rule_source:
+                row_issue = row_issues[offset][2]
+                field_name = row_issue.field
+                dimension, severity = row_issue.dimension, row_issue.severity
+                kept = row_issue if sampler.admit(field_name, row_issue.rule_name, severity) else None
+            else:
+                pos, rule = fail_keys[source]
+                field_name, dimension, severity = fields[pos], rule.dimension, rule.severity
+                kept = None
+                if sampler.admit(field_name, rule.name, severity):
+                    kept = QualityIssue(
+                        field=field_name,
+                        rule_name=rule.name,
+                        dimension=dimension,
+                        severity=severity,
+                        message=f"{rule.description}: {rule.name} failed",
+                        value=columns[pos][0][row],
+                        row_index=row,
+                    )
+            if kept is not None:
+                all_issues.append(kept)
+            failures_by_field.setdefault(field_name, []).append((row, kept))
+        
+        field_reports: dict[str, FieldQualityReport] = {}
+        for pos, field_name in enumerate(fields):
+            null = columns[pos][1]
+            report = FieldQualityReport(field=field_name, total_records=n)
+            invalid_rows: set[int] = set()
+            for row, failed in failures_by_field.get(field_name, ()):
+                if not null[row]:
+                    if failed is not None:
+                        report.issues.append(failed)
+                    invalid_rows.add(row)
+            report.null_count = int(null.sum())
+            report.invalid_count = len(invalid_rows)
+            report.valid_count = n - report.null_count - report.invalid_count
+            field_reports[field_name] = report
+        
+        # Row and dimension tallies straight from the failing-row arrays
+        error_mask = np.zeros(n, dtype=bool)
+        validity_mask = np.zeros(n, dtype=bool)
+        uniqueness_count = 0
+        for (_, rule), failed_rows in zip(fail_keys, fail_rows, strict=True):
+            if rule.severity == Severity.ERROR:
+                error_mask[failed_rows] = True
+            if rule.dimension == QualityDimension.VALIDITY:
+                validity_mask[failed_rows] = True
+            elif rule.dimension == QualityDimension.UNIQUENESS:
+                uniqueness_count += len(failed_rows)
+        for row, _, issue in row_issues:
+            if issue.severity == Severity.ERROR:
+                error_mask[row] = True
+            if issue.dimension == QualityDimension.VALIDITY:
+                validity_mask[row] = True
+            elif issue.dimension == QualityDimension.UNIQUENESS:
+                uniqueness_count += 1
+        invalid_count = int(error_mask.sum())
+        
+        dimension_scores = self._calculate_dimension_scores(
+            n, field_reports, int(validity_mask.sum()), uniqueness_count
+        )
+        
+        duration_ms = int((time.time() - start_time) * 1000)
+        
+        return DataQualityReport(
+            dataset_name=self.dataset_name,
+            total_records=n,
+            valid_records=n - invalid_count,
+            invalid_records=invalid_count,
+            field_reports=field_reports,
+            issues=all_issues,
+            suppressed_issues=sampler.suppressed,
             dimension_scores=dimension_scores,
             duration_ms=duration_ms,
         )
     
     def _calculate_dimension_scores(
         self,
-        records: list[dict[str, Any]],
+        record_count: int,
         field_reports: dict[str, FieldQualityReport],
-        issues: list[QualityIssue],
+        validity_rows: int,
+        uniqueness_count: int,
     ) -> dict[str, float]:
         """Calculate quality scores by dimension."""
         scores: dict[str, float] = {}
@@ -445,18 +1011,15 @@ class DataQualityValidator:
             )
         
         # Validity: percentage of records without validity errors
-        validity_issues = [i for i in issues if i.dimension == QualityDimension.VALIDITY]
-        if records:
-            affected_rows = len(set(i.row_index for i in validity_issues if i.row_index is not None))
+        if record_count:
             scores[QualityDimension.VALIDITY.value] = (
-                (len(records) - affected_rows) / len(records) * 100
+                (record_count - validity_rows) / record_count * 100
             )
         
         # Uniqueness
-        uniqueness_issues = [i for i in issues if i.dimension == QualityDimension.UNIQUENESS]
-        if records:
+        if record_count:
             scores[QualityDimension.UNIQUENESS.value] = (
-                (len(records) - len(uniqueness_issues)) / len(records) * 100
+                (record_count - uniqueness_count) / record_count * 100
             )
         
         return scores
@@ -602,7 +1165,27 @@ def create_encounter_validator() -> DataQualityValidator:
         
         return issues
     
-    validator.add_row_rule(validate_timing)
+    def validate_timing_frame(df: pd.DataFrame) -> list[QualityIssue] | None:
+        if "actual_start" not in df.columns or "actual_end" not in df.columns:
+            return []
+        starts = _datetime_column(df["actual_start"])
+        ends = _datetime_column(df["actual_end"])
+        if starts is None or ends is None:
+            return None
+        return [
+            QualityIssue(
+                field="actual_end",
+                rule_name="end_after_start",
+                dimension=QualityDimension.CONSISTENCY,
+                severity=Severity.ERROR,
+                message="End time must be after start time",
+                value={"start": str(starts[1][row]), "end": str(ends[1][row])},
+                row_index=row,
+            )
+            for row in np.flatnonzero(ends[0] < starts[0]).tolist()
+        ]
+    
+    validator.add_row_rule(validate_timing, validate_timing_frame)
     
     return validator
 
@@ -8,15 +8,46 @@ All transforms are deterministic and reproducible.
 from __future__ import annotations
 
 import hashlib
+import inspect
+import json
+import re
+import time
 from abc import ABC, abstractmethod
+from collections.abc import Iterable
 from dataclasses import dataclass, field
-from datetime import datetime
+from datetime import date, datetime
+from functools import lru_cache
+from itertools import repeat
 from typing import Any, Callable, Generic, TypeVar
 
 from pydantic import BaseModel, Field
 
+from .._luhn import luhn_sum
+from ..models.healthcare import validate_npi_bulk
+
 T = TypeVar("T")
 
+# Characters stripped from ICD-10 codes during normalization
+_ICD10_DISALLOWED = re.compile(r"[^A-Z0-9.]")
+
+
+# =============================================================================
+# DATA HASHING
+# =============================================================================
+
+
+def _hash_data(data: Any) -> str:
+    """Deterministic short hash of JSON-serializable data."""
+    json_str = json.dumps(data, sort_keys=True, default=str)
+    return hashlib.sha256(json_str.encode()).hexdigest()[:16]
+
+
+# Bounded so transform classes created at runtime can still be collected
+@lru_cache(maxsize=128)
+def _accepts_input_hash(method: Callable[..., Any]) -> bool:
+    """Whether a transform() implementation takes a precomputed input_hash."""
+    return "input_hash" in inspect.signature(method).parameters
+
 
 # =============================================================================
 # TRANSFORM RESULT
@@ -70,14 +101,17 @@ class BaseTransform(ABC, Generic[T]):
     
     @abstractmethod
     def transform(self, data: T) -> TransformResult[T]:
-        """Apply transformation to data."""
+        """
+        Apply transformation to data.
+        
+        Implementations may also accept an ``input_hash`` keyword, which
+        TransformPipeline fills with the already computed hash of ``data``.
+        """
         pass
     
     def _compute_hash(self, data: Any) -> str:
         """Compute deterministic hash of data."""
-        import json
-        json_str = json.dumps(data, sort_keys=True, default=str)
-        return hashlib.sha256(json_str.encode()).hexdigest()[:16]
+        return _hash_data(data)
 
 
 # =============================================================================
@@ -94,9 +128,9 @@ class FilterTransform(BaseTransform[list[dict[str, Any]]]):
     def transform(
         self,
         data: list[dict[str, Any]],
+        input_hash: str | None = None,
     ) -> TransformResult[list[dict[str, Any]]]:
         """Filter records."""
-        import time
         start = time.time()
         
         result_data = []
@@ -120,7 +154,7 @@ class FilterTransform(BaseTransform[list[dict[str, Any]]]):
             input_count=len(data),
             output_count=len(result_data),
             filtered_count=filtered,
-            input_hash=self._compute_hash(data),
+            input_hash=input_hash or self._compute_hash(data),
             output_hash=self._compute_hash(result_data),
             duration_ms=duration,
             completed_at=datetime.utcnow(),
@@ -137,9 +171,9 @@ class MapTransform(BaseTransform[list[dict[str, Any]]]):
     def transform(
         self,
         data: list[dict[str, Any]],
+        input_hash: str | None = None,
     ) -> TransformResult[list[dict[str, Any]]]:
         """Map records."""
-        import time
         start = time.time()
         
         result_data = []
@@ -167,7 +201,7 @@ class MapTransform(BaseTransform[list[dict[str, Any]]]):
             input_count=len(data),
             output_count=len(result_data),
             failed_count=failed,
-            input_hash=self._compute_hash(data),
+            input_hash=input_hash or self._compute_hash(data),
             output_hash=self._compute_hash(result_data) if result_data else "",
             duration_ms=duration,
             completed_at=datetime.utcnow(),
@@ -184,20 +218,17 @@ class SelectTransform(BaseTransform[list[dict[str, Any]]]):
     def transform(
         self,
         data: list[dict[str, Any]],
+        input_hash: str | None = None,
     ) -> TransformResult[list[dict[str, Any]]]:
         """Select fields."""
-        import time
         start = time.time()
         
-        result_data = []
-        
-        for record in data:
-            new_record = {}
-            for f in self.fields:
-                value = record.get(f)
-                new_key = self.rename.get(f, f)
-                new_record[new_key] = value
-            result_data.append(new_record)
+        # (source field, output key) pairs, resolved once per call
+        columns = [(f, self.rename.get(f, f)) for f in self.fields]
+        result_data = [
+            {key: record.get(f) for f, key in columns}
+            for record in data
+        ]
         
         duration = int((time.time() - start) * 1000)
         
@@ -207,7 +238,7 @@ class SelectTransform(BaseTransform[list[dict[str, Any]]]):
             transform_name=self.name,
             input_count=len(data),
             output_count=len(result_data),
-            input_hash=self._compute_hash(data),
+            input_hash=input_hash or self._compute_hash(data),
             output_hash=self._compute_hash(result_data),
             duration_ms=duration,
             completed_at=datetime.utcnow(),
@@ -219,20 +250,25 @@ class DeriveTransform(BaseTransform[list[dict[str, Any]]]):
     """Derive new fields from existing data."""
     
     derivations: dict[str, Callable[[dict[str, Any]], Any]] = field(default_factory=dict)
+    inplace: bool = False  # update the input records instead of copies
     
     def transform(
         self,
         data: list[dict[str, Any]],
+        input_hash: str | None = None,
     ) -> TransformResult[list[dict[str, Any]]]:
         """Derive new fields."""
-        import time
+        # Hashed up front, before any record is updated in place
+        input_hash = input_hash or self._compute_hash(data)
         start = time.time()
         
         result_data = []
         errors = []
         
         for idx, record in enumerate(data):
-            new_record = record.copy()
+            # In place, derived values are collected first so every
+            # derivation still sees the original record
+            new_record = {} if self.inplace else record.copy()
             
             for field_name, derivation in self.derivations.items():
                 try:
@@ -241,6 +277,9 @@ class DeriveTransform(BaseTransform[list[dict[str, Any]]]):
                     errors.append(f"Record {idx}, field {field_name}: {str(e)}")
                     new_record[field_name] = None
             
+            if self.inplace:
+                record.update(new_record)
+                new_record = record
             result_data.append(new_record)
         
         duration = int((time.time() - start) * 1000)
@@ -252,7 +291,7 @@ class DeriveTransform(BaseTransform[list[dict[str, Any]]]):
             transform_name=self.name,
             input_count=len(data),
             output_count=len(result_data),
-            input_hash=self._compute_hash(data),
+            input_hash=input_hash,
             output_hash=self._compute_hash(result_data),
             duration_ms=duration,
             completed_at=datetime.utcnow(),
@@ -269,18 +308,27 @@ class DeduplicateTransform(BaseTransform[list[dict[str, Any]]]):
     def transform(
         self,
         data: list[dict[str, Any]],
+        input_hash: str | None = None,
     ) -> TransformResult[list[dict[str, Any]]]:
         """Deduplicate records."""
-        import time
         start = time.time()
         
-        seen: dict[tuple, dict[str, Any]] = {}
+        # Key tuples built column by column
+        keys: Iterable[tuple[Any, ...]] = (
+            zip(*[[record.get(f) for record in data] for f in self.key_fields], strict=True)
+            if self.key_fields
+            else repeat(())
+        )
         
-        for record in data:
-            key = tuple(record.get(f) for f in self.key_fields)
-            
-            if key not in seen or self.keep == "last":
-                seen[key] = record
+        seen: dict[tuple[Any, ...], dict[str, Any]]
+        if self.keep == "last":
+            # Keys keep their first position, values end on the last record
+            seen = dict(zip(keys, data, strict=False))
+        else:
+            seen = {}
+            for key, record in zip(keys, data, strict=False):
+                if key not in seen:
+                    seen[key] = record
         
         result_data = list(seen.values())
         duplicates = len(data) - len(result_data)
@@ -294,7 +342,7 @@ class DeduplicateTransform(BaseTransform[list[dict[str, Any]]]):
             input_count=len(data),
             output_count=len(result_data),
             filtered_count=duplicates,
-            input_hash=self._compute_hash(data),
+            input_hash=input_hash or self._compute_hash(data),
             output_hash=self._compute_hash(result_data),
             duration_ms=duration,
             completed_at=datetime.utcnow(),
@@ -313,46 +361,54 @@ class AgeCalculatorTransform(BaseTransform[list[dict[str, Any]]]):
     dob_field: str = "date_of_birth"
     output_field: str = "age"
     reference_date: datetime | None = None
+    inplace: bool = False  # update the input records instead of copies
     
     def transform(
         self,
         data: list[dict[str, Any]],
+        input_hash: str | None = None,
     ) -> TransformResult[list[dict[str, Any]]]:
         """Calculate ages."""
-        from datetime import date
-        import time
+        # Hashed up front, before any record is updated in place
+        input_hash = input_hash or self._compute_hash(data)
         start = time.time()
         
         ref = self.reference_date or datetime.now()
         if isinstance(ref, datetime):
             ref = ref.date()
+        ref_day = (ref.month, ref.day)
         
         result_data = []
         errors = []
         
+        # Age (or parse error) per distinct date string, parsed once
+        parsed: dict[str, tuple[int | None, str | None]] = {}
+        
         for idx, record in enumerate(data):
-            new_record = record.copy()
+            new_record = record if self.inplace else record.copy()
             dob = record.get(self.dob_field)
+            age = None
             
             if dob:
-                try:
-                    if isinstance(dob, str):
-                        dob = datetime.fromisoformat(dob).date()
-                    elif isinstance(dob, datetime):
-                        dob = dob.date()
-                    
-                    if isinstance(dob, date):
-                        age = ref.year - dob.year - (
-                            (ref.month, ref.day) < (dob.month, dob.day)
-                        )
-                        new_record[self.output_field] = age
-                    else:
-                        new_record[self.output_field] = None
-                except Exception as e:
-                    errors.append(f"Record {idx}: {str(e)}")
-                    new_record[self.output_field] = None
-            else:
-                new_record[self.output_field] = None
+                if isinstance(dob, str):
+                    known = parsed.get(dob)
+                    if known is None:
+                        try:
+                            born = datetime.fromisoformat(dob)
+                            known = (
+                                ref.year - born.year - (ref_day < (born.month, born.day)),
+                                None,
+                            )
+                        except Exception as e:
+                            known = (None, str(e))
+                        parsed[dob] = known
+                    age, error = known
+                    if error is not None:
+                        errors.append(f"Record {idx}: {error}")
+                elif isinstance(dob, date):
+                    age = ref.year - dob.year - (ref_day < (dob.month, dob.day))
+            
+            new_record[self.output_field] = age
             
             result_data.append(new_record)
         
@@ -365,7 +421,7 @@ class AgeCalculatorTransform(BaseTransform[list[dict[str, Any]]]):
             transform_name=self.name,
             input_count=len(data),
             output_count=len(result_data),
-            input_hash=self._compute_hash(data),
+            input_hash=input_hash,
             output_hash=self._compute_hash(result_data),
             duration_ms=duration,
             completed_at=datetime.utcnow(),
@@ -380,32 +436,42 @@ class ICD10ValidatorTransform(BaseTransform[list[dict[str, Any]]]):
     output_valid_field: str = "is_valid_icd10"
     normalize: bool = True
     ICD10_PATTERN: str = r"^[A-Z]\d{2}(\.\d{1,4})?$"
+    inplace: bool = False  # update the input records instead of copies
     
     def transform(
         self,
         data: list[dict[str, Any]],
+        input_hash: str | None = None,
     ) -> TransformResult[list[dict[str, Any]]]:
         """Validate ICD-10 codes."""
-        import re
-        import time
+        # Hashed up front, before any record is updated in place
+        input_hash = input_hash or self._compute_hash(data)
         start = time.time()
         
         pattern = re.compile(self.ICD10_PATTERN)
         result_data = []
         invalid_count = 0
         
+        # Diagnosis codes repeat heavily, so each distinct one is checked once
+        checked: dict[str, tuple[str, bool]] = {}
+        
         for record in data:
-            new_record = record.copy()
+            new_record = record if self.inplace else record.copy()
             code = record.get(self.code_field)
             
             if code:
-                code_str = str(code).upper().strip()
+                raw = str(code)
+                check = checked.get(raw)
+                if check is None:
+                    code_str = raw.upper().strip()
+                    if self.normalize:
+                        code_str = _ICD10_DISALLOWED.sub("", code_str)
+                    check = checked[raw] = (code_str, pattern.match(code_str) is not None)
+                code_str, is_valid = check
                 
                 if self.normalize:
-                    code_str = re.sub(r"[^A-Z0-9.]", "", code_str)
                     new_record[self.code_field] = code_str
                 
-                is_valid = bool(pattern.match(code_str))
                 new_record[self.output_valid_field] = is_valid
                 
                 if not is_valid:
@@ -424,7 +490,7 @@ class ICD10ValidatorTransform(BaseTransform[list[dict[str, Any]]]):
             input_count=len(data),
             output_count=len(result_data),
             failed_count=invalid_count,
-            input_hash=self._compute_hash(data),
+            input_hash=input_hash,
             output_hash=self._compute_hash(result_data),
             duration_ms=duration,
             completed_at=datetime.utcnow(),
@@ -437,24 +503,29 @@ class NPIValidatorTransform(BaseTransform[list[dict[str, Any]]]):
     
     npi_field: str = "npi"
     output_valid_field: str = "is_valid_npi"
+    inplace: bool = False  # update the input records instead of copies
     
     def transform(
         self,
         data: list[dict[str, Any]],
+        input_hash: str | None = None,
     ) -> TransformResult[list[dict[str, Any]]]:
         """Validate NPIs using Luhn algorithm."""
-        import time
+        # Hashed up front, before any record is updated in place
+        input_hash = input_hash or self._compute_hash(data)
         start = time.time()
         
         result_data = []
         invalid_count = 0
         
-        for record in data:
-            new_record = record.copy()
-            npi = record.get(self.npi_field)
+        # Checksum every NPI in one vectorized pass
+        npis = [record.get(self.npi_field) for record in data]
+        checks = validate_npi_bulk(str(npi) if npi else None for npi in npis).tolist()
+        
+        for record, npi, is_valid in zip(data, npis, checks, strict=True):
+            new_record = record if self.inplace else record.copy()
             
             if npi:
-                is_valid = self._validate_npi(str(npi))
                 new_record[self.output_valid_field] = is_valid
                 
                 if not is_valid:
@@ -473,7 +544,7 @@ class NPIValidatorTransform(BaseTransform[list[dict[str, Any]]]):
             input_count=len(data),
             output_count=len(result_data),
             failed_count=invalid_count,
-            input_hash=self._compute_hash(data),
+            input_hash=input_hash,
             output_hash=self._compute_hash(result_data),
             duration_ms=duration,
             completed_at=datetime.utcnow(),
@@ -484,18 +555,7 @@ class NPIValidatorTransform(BaseTransform[list[dict[str, Any]]]):
         if not npi.isdigit() or len(npi) != 10:
             return False
         
-        npi_with_prefix = "80840" + npi
-        total = 0
-        
-        for i, digit in enumerate(reversed(npi_with_prefix)):
-            n = int(digit)
-            if i % 2 == 0:
-                n *= 2
-                if n > 9:
-                    n -= 9
-            total += n
-        
-        return total % 10 == 0
+        return luhn_sum("80840" + npi, double_last=True) % 10 == 0
 
 
 # =============================================================================
@@ -525,7 +585,6 @@ class TransformPipeline:
         data: list[dict[str, Any]],
     ) -> TransformResult[list[dict[str, Any]]]:
         """Execute all transforms in sequence."""
-        import time
         start = time.time()
         
         self.results = []
@@ -536,9 +595,15 @@ class TransformPipeline:
         all_warnings: list[str] = []
         
         input_hash = self._compute_hash(data)
+        # Hash of current_data as handed to the next stage; each stage's
+        # output hash is passed on instead of serializing the data again
+        boundary_hash = input_hash
         
         for transform in self.transforms:
-            result = transform.transform(current_data)
+            hashes: dict[str, Any] = {}
+            if boundary_hash and _accepts_input_hash(type(transform).transform):
+                hashes["input_hash"] = boundary_hash
+            result = transform.transform(current_data, **hashes)
             self.results.append(result)
             
             total_filtered += result.filtered_count
@@ -564,9 +629,10 @@ class TransformPipeline:
                 )
             
             current_data = result.data or []
+            boundary_hash = result.output_hash
         
         duration = int((time.time() - start) * 1000)
-        output_hash = self._compute_hash(current_data)
+        output_hash = boundary_hash or self._compute_hash(current_data)
         
         return TransformResult(
             success=True,
@@ -586,9 +652,7 @@ class TransformPipeline:
     
     def _compute_hash(self, data: Any) -> str:
         """Compute deterministic hash of data."""
-        import json
-        json_str = json.dumps(data, sort_keys=True, default=str)
-        return hashlib.sha256(json_str.encode()).hexdigest()[:16]
+        return _hash_data(data)
     
     def get_lineage(self) -> list[dict[str, Any]]:
         """Get lineage information for all executed transforms."""
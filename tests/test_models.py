@@ -3,6 +3,7 @@
 from datetime import date, datetime
 from decimal import Decimal
 
+import numpy as np
 import pytest
 from pydantic import ValidationError
 
@@ -19,6 +20,8 @@ from pipeline.models import (
     Claim,
     ClaimLine,
     ClaimStatus,
+    compute_abnormal_bulk,
+    validate_npi_bulk,
 )
 
 
@@ -85,6 +88,13 @@ class TestPatient:
             ssn="123 45 6789",
         )
         assert patient2.ssn == "123-45-6789"
+        
+        patient3 = Patient(
+            mrn="M3", first_name="A", last_name="B",
+            date_of_birth=date(1990, 1, 1),
+            ssn="123\u201345\u20136789",  # En dashes
+        )
+        assert patient3.ssn == "123-45-6789"
 
     def test_ssn_validation_invalid(self):
         """Test SSN validation rejects invalid formats."""
@@ -152,6 +162,48 @@ class TestPatient:
         )
         assert patient.age == expected_age
 
+    def test_ages_bulk(self):
+        """Test bulk age calculation against a fixed date."""
+        patients = [
+            Patient(mrn="M1", first_name="A", last_name="B", date_of_birth=date(1990, 6, 15)),
+            Patient(mrn="M2", first_name="C", last_name="D", date_of_birth=date(2000, 1, 1)),
+        ]
+        
+        assert Patient.ages_bulk(patients, today=date(2024, 6, 14)) == [33, 24]
+        assert Patient.ages_bulk(patients) == [p.age for p in patients]
+
+    def test_derived_fields_follow_assignment(self):
+        """Test cached full_name and age are refreshed when their fields change."""
+        patient = Patient(
+            mrn="M1", first_name="Ann", last_name="Lee",
+            date_of_birth=date(1990, 1, 1),
+        )
+        assert patient.full_name == "Ann Lee"
+        age = patient.age
+        
+        patient.middle_name = "Marie"
+        patient.date_of_birth = date(1980, 1, 1)
+        
+        assert patient.full_name == "Ann Marie Lee"
+        assert patient.age == age + 10
+        assert "full_name" not in patient.model_dump()
+        
+        renamed = patient.model_copy(update={"last_name": "Kim"})
+        assert renamed.full_name == "Ann Marie Kim"
+
+    def test_derived_fields_do_not_affect_equality(self):
+        """Test reading cached age and full_name keeps equal patients equal."""
+        patient = Patient(
+            mrn="M1", first_name="Ann", last_name="Lee",
+            date_of_birth=date(1990, 1, 1),
+        )
+        same = Patient(**patient.model_dump())
+        
+        assert patient.age > 30
+        assert patient.full_name
+        assert patient == same
+        assert patient.model_dump() == same.model_dump()
+
     def test_phi_fields(self):
         """Test PHI field identification."""
         patient = Patient(
@@ -187,6 +239,25 @@ class TestPatient:
         assert safe["last_name"] == "[REDACTED]"
         assert safe["patient_id"] is not None  # Non-PHI field preserved
 
+    def test_safe_dict_matches_model_dump(self):
+        """Test non-PHI values in safe_dict match model_dump(), nested included."""
+        encounter = Encounter(
+            patient_id="pat_123",
+            encounter_type=EncounterType.OUTPATIENT,
+            notes="Follow-up",
+            diagnoses=[Diagnosis(code="E11.9", description="Type 2 diabetes")],
+        )
+        
+        safe = encounter.to_safe_dict()
+        dumped = encounter.model_dump()
+        
+        assert list(safe) == list(dumped)
+        assert safe["patient_id"] == "[REDACTED]"
+        assert safe["notes"] == "[REDACTED]"
+        assert safe["diagnoses"] == dumped["diagnoses"]
+        assert isinstance(safe["diagnoses"][0], dict)
+        assert safe["encounter_type"] == dumped["encounter_type"]
+
 
 # =============================================================================
 # ENCOUNTER TESTS
@@ -349,6 +420,17 @@ class TestLabResult:
         )
         assert low.is_abnormal is True
 
+    def test_compute_abnormal_bulk(self):
+        """Test vectorized abnormal flags match the per-record validator."""
+        nan = float("nan")
+        values = [95.0, 150.0, 50.0, 150.0, nan]
+        lows = [70.0, 70.0, 70.0, nan, 70.0]
+        highs = [100.0, 100.0, 100.0, nan, 100.0]
+        
+        flags = compute_abnormal_bulk(np.array(values), np.array(lows), np.array(highs))
+        
+        assert flags.tolist() == [False, True, True, False, False]
+
 
 # =============================================================================
 # CLAIM TESTS
@@ -427,6 +509,15 @@ class TestClaim:
                 service_date_to=date(2024, 1, 15),
             )
 
+    def test_validate_npi_bulk(self):
+        """Test vectorized NPI checks match the per-claim validator."""
+        npis = ["1234567897", "1234567890", None, "123456789", "12345678AB", "1234567897"]
+        
+        valid = validate_npi_bulk(npis)
+        
+        assert valid.tolist() == [True, False, False, False, False, True]
+        assert validate_npi_bulk([]).tolist() == []
+
     def test_claim_adjudication_status(self):
         """Test claim adjudication status."""
         claim = Claim(
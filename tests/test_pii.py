@@ -1,9 +1,13 @@
 """Tests for PII detection and handling."""
 
+import re
+import weakref
+
 import pytest
 
 from pipeline.pii import (
     PIIType,
+    PIIPattern,
     PIIDetector,
     PIIMasker,
     MaskingStrategy,
@@ -73,6 +77,15 @@ class TestPIIDetector:
         assert PIIType.CREDIT_CARD in result.pii_types_found
         assert result.matches[0].confidence >= 0.85
 
+    def test_credit_card_failing_luhn_low_confidence(self):
+        """Test card-shaped numbers failing the Luhn check lose confidence."""
+        detector = PIIDetector()
+
+        result = detector.scan_text("Card: 4111-1111-1111-1112")
+
+        assert result.matches[0].pii_type == PIIType.CREDIT_CARD
+        assert result.matches[0].confidence < 0.85
+
     def test_detect_ip_address(self):
         """Test IP address detection."""
         detector = PIIDetector()
@@ -101,6 +114,25 @@ class TestPIIDetector:
         assert not result.has_pii
         assert len(result.matches) == 0
 
+    def test_non_ascii_digits(self):
+        """Test the character pre-check does not skip non-ASCII digits."""
+        detector = PIIDetector()
+        
+        result = detector.scan_text("SSN: \u0661\u0662\u0663-45-6789")
+        
+        assert PIIType.SSN in result.pii_types_found
+
+    def test_add_pattern_is_per_detector(self):
+        """Test custom patterns do not leak into other detectors."""
+        detector = PIIDetector()
+        detector.add_pattern(PIIPattern(
+            PIIType.DEVICE_ID,
+            re.compile(r"\b(DEV-[A-Z0-9]{6})\b"),
+        ))
+        
+        assert PIIType.DEVICE_ID in detector.scan_text("Pump DEV-AB12CD").pii_types_found
+        assert not PIIDetector().scan_text("Pump DEV-AB12CD").has_pii
+
     def test_multiple_pii(self):
         """Test detecting multiple PII in one text."""
         detector = PIIDetector()
@@ -138,6 +170,72 @@ class TestPIIDetector:
         assert "email" in results
         assert results["ssn"][0].confidence == 1.0  # Known field
 
+    def test_scan_dict_matches_per_field_scan(self):
+        """Test scan_dict matches scanning each field on its own."""
+        detector = PIIDetector()
+
+        data = {
+            "notes": "Call 555-123-4567 about 123-45-6789",
+            "zip": 12345,
+            "empty": "",
+            "contact": "jane@example.com",
+            "ip": "10.0.0.1",
+            "missing": None,
+        }
+
+        results = detector.scan_dict(data)
+
+        expected = {
+            key: detector.scan_text(str(value)).matches
+            for key, value in data.items()
+            if value is not None and detector.scan_text(str(value)).has_pii
+        }
+        assert list(results) == ["notes", "zip", "contact", "ip"]
+        for key, matches in expected.items():
+            assert [(m.pii_type, m.value, m.start, m.end) for m in results[key]] == [
+                (m.pii_type, m.value, m.start, m.end) for m in matches
+            ]
+
+    def test_scan_dict_typed_values(self):
+        """Test scan_dict on non-string values."""
+        from datetime import date, datetime
+        
+        detector = PIIDetector()
+        
+        data = {
+            "dob": date(1990, 5, 15),
+            "admitted": datetime(2024, 1, 15, 10, 30),
+            "active": True,
+            "ssn": 123456789,
+            "seen": date(2024, 1, 15),
+        }
+        
+        results = detector.scan_dict(data, {"seen": PIIType.ADMISSION_DATE})
+        
+        assert list(results) == ["ssn", "seen"]
+        assert results["ssn"][0].pii_type == PIIType.SSN
+        assert results["seen"][0].value == "2024-01-15"
+
+    def test_scan_dict_timestamp_subclass(self):
+        """Test date subclasses whose text may hold PII are still scanned."""
+        import pandas as pd
+        
+        detector = PIIDetector()
+        
+        results = detector.scan_dict({"seen_at": pd.Timestamp("2024-01-01 12:34:56.123456789")})
+        
+        assert results["seen_at"][0].value == "123456789"
+
+    def test_many_overlapping_matches(self):
+        """Test overlap removal on texts with many matches."""
+        detector = PIIDetector()
+
+        result = detector.scan_text("SSN 123-45-6789, ZIP 12345. " * 40)
+
+        assert len(result.matches) == 80
+        assert [m.pii_type for m in result.matches[:2]] == [PIIType.SSN, PIIType.ZIP_CODE]
+        assert all(a.end <= b.start for a, b in zip(result.matches, result.matches[1:], strict=False))
+
     def test_high_confidence_matches(self):
         """Test filtering high confidence matches."""
         detector = PIIDetector()
@@ -186,6 +284,79 @@ class TestPIIMasker:
         assert masked1 == masked2
         assert len(masked1) == 16
 
+    def test_partial_strategy_fallback(self):
+        """Test PARTIAL masking falls back to first and last character."""
+        masker = PIIMasker(default_strategy=MaskingStrategy.PARTIAL)
+        
+        assert masker.mask_value("12", PIIType.SSN) == "**"
+        assert masker.mask_value("MRN12345", PIIType.MRN) == "M******5"
+        assert masker.mask_value("no-at-sign", PIIType.EMAIL) == "n********n"
+
+    def test_hash_strategy_blake2s(self):
+        """Test HASH masking with keyed BLAKE2s."""
+        masker = PIIMasker(
+            default_strategy=MaskingStrategy.HASH, salt="test", hash_algo="blake2s"
+        )
+
+        masked = masker.mask_value("123-45-6789", PIIType.SSN)
+
+        assert masked == masker.mask_value("123-45-6789", PIIType.SSN)
+        assert len(masked) == 16
+        assert masked != masker.mask_value("123-45-6789", PIIType.PHONE)
+        assert masked != PIIMasker(salt="other", hash_algo="blake2s").mask_value(
+            "123-45-6789", PIIType.SSN, MaskingStrategy.HASH
+        )
+        # Salts longer than a BLAKE2s key are accepted
+        assert len(PIIMasker(salt="x" * 64, hash_algo="blake2s").mask_value(
+            "123-45-6789", PIIType.SSN, MaskingStrategy.HASH
+        )) == 16
+
+    def test_blake2s_salt_change(self):
+        """Test BLAKE2s hashes follow a changed salt."""
+        masker = PIIMasker(default_strategy=MaskingStrategy.HASH, hash_algo="blake2s")
+        masker.mask_value("123-45-6789", PIIType.SSN)
+        
+        masker.salt = "other"
+        masker.cache_clear()
+        
+        assert masker.mask_value("123-45-6789", PIIType.SSN) == PIIMasker(
+            default_strategy=MaskingStrategy.HASH, salt="other", hash_algo="blake2s"
+        ).mask_value("123-45-6789", PIIType.SSN)
+
+    def test_mask_cache_follows_salt_and_algo(self):
+        """Test changing salt or hash_algo bypasses earlier cached masks."""
+        masker = PIIMasker(default_strategy=MaskingStrategy.HASH)
+        masker.mask_value("123-45-6789", PIIType.SSN)
+        
+        for salt, hash_algo in (("other", "sha256"), ("other", "blake2s")):
+            masker.salt = salt
+            masker.hash_algo = hash_algo
+            
+            assert masker.mask_value("123-45-6789", PIIType.SSN) == PIIMasker(
+                default_strategy=MaskingStrategy.HASH, salt=salt, hash_algo=hash_algo
+            ).mask_value("123-45-6789", PIIType.SSN)
+        
+        # The cache does not hold the masker alive
+        ref = weakref.ref(masker)
+        del masker
+        assert ref() is None
+
+    def test_mask_cache(self):
+        """Test repeated values are served from the mask cache."""
+        masker = PIIMasker(default_strategy=MaskingStrategy.PARTIAL)
+        
+        for _ in range(3):
+            assert masker.mask_value("555-123-4567", PIIType.PHONE) == "(***) ***-4567"
+        assert masker._mask_cached.cache_info().hits == 2
+        
+        masker.cache_clear()
+        assert masker._mask_cached.cache_info().currsize == 0
+
+    def test_unsupported_hash_algo(self):
+        """Test an unknown hash algorithm is rejected."""
+        with pytest.raises(ValueError, match="Unsupported hash algorithm"):
+            PIIMasker(hash_algo="md5")
+
     def test_partial_strategy_ssn(self):
         """Test PARTIAL masking for SSN."""
         masker = PIIMasker(default_strategy=MaskingStrategy.PARTIAL)
@@ -233,6 +404,26 @@ class TestPIIMasker:
         original = masker.detokenize(token1)
         assert original == "123-45-6789"
 
+    def test_token_map_bounded(self):
+        """Test max_tokens evicts the least recently used token."""
+        masker = PIIMasker(default_strategy=MaskingStrategy.TOKEN, max_tokens=2)
+        
+        first = masker.mask_value("111-11-1111", PIIType.SSN)
+        second = masker.mask_value("222-22-2222", PIIType.SSN)
+        assert masker.mask_value("111-11-1111", PIIType.SSN) == first
+        masker.mask_value("333-33-3333", PIIType.SSN)
+        
+        # The second value was least recently used
+        assert masker.detokenize(first) == "111-11-1111"
+        assert masker.detokenize(second) is None
+        assert len(masker._token_map) == len(masker._reverse_map) == 2
+
+    def test_max_tokens_must_be_positive(self):
+        """Test a token bound below one is rejected."""
+        for max_tokens in (0, -1):
+            with pytest.raises(ValueError, match="max_tokens"):
+                PIIMasker(default_strategy=MaskingStrategy.TOKEN, max_tokens=max_tokens)
+
     def test_category_strategy(self):
         """Test CATEGORY masking strategy."""
         masker = PIIMasker(default_strategy=MaskingStrategy.CATEGORY)
@@ -254,6 +445,18 @@ class TestPIIMasker:
         assert "john@example.com" not in masked
         assert "[EMAIL_REDACTED]" in masked
 
+    def test_mask_text_unsorted_matches(self):
+        """Test masking with matches given out of order."""
+        detector = PIIDetector()
+        masker = PIIMasker(default_strategy=MaskingStrategy.REDACT)
+        
+        text = "SSN 123-45-6789, email a@b.com, end"
+        matches = list(reversed(detector.scan_text(text).matches))
+        
+        masked = masker.mask_text(text, matches)
+        
+        assert masked == "SSN [SSN_REDACTED], email [EMAIL_REDACTED], end"
+
     def test_mask_dict(self):
         """Test masking dictionary fields."""
         masker = PIIMasker(default_strategy=MaskingStrategy.REDACT)
@@ -396,3 +599,24 @@ class TestSafeHarborDeidentifier:
         assert result["first_name"] == "[REDACTED]"
         assert result["gender"] == "male"
         assert result["is_active"] is True
+
+    def test_other_fields_untouched(self):
+        """Test non-identifier fields pass through and the input is not modified."""
+        deidentifier = SafeHarborDeidentifier()
+        
+        patient_data = {
+            "ssn": "123-45-6789",
+            "gender": "F",
+            "zip_code": "",
+            "date_of_birth": "not a date",
+        }
+        
+        result = deidentifier.deidentify_patient(patient_data)
+        
+        assert result == {
+            "ssn": "[REDACTED]",
+            "gender": "F",
+            "zip_code": "",
+            "date_of_birth": "not a date",
+        }
+        assert patient_data["ssn"] == "123-45-6789"
@@ -14,6 +14,7 @@ from pipeline.run import (
     validate_data,
     transform_data,
     compute_file_hash,
+    write_csv,
 )
 
 
@@ -131,6 +132,7 @@ class TestTransformations:
         assert "value_squared" in result.columns
         assert result["value_squared"].tolist() == [4, 9, 16]
         assert "processed_at" in result.columns
+        assert list(df.columns) == ["id", "value"]
 
 
 class TestPipeline:
@@ -166,6 +168,95 @@ class TestPipeline:
         output_df = pd.read_csv(output_path)
         assert "value_squared" in output_df.columns
 
+    def test_run_pipeline_chunked(self, tmp_path: Path):
+        """Test streaming the input in chunks gives the same output."""
+        input_path = tmp_path / "input.csv"
+        pd.DataFrame({
+            "id": [1, 2, None, 4, 5, None, 7],
+            "value": [10, 20, 30, 40, 50, 60, 70],
+        }).to_csv(input_path, index=False)
+        
+        results = {}
+        for chunk_size in (None, 2):
+            output_path = tmp_path / f"output_{chunk_size}.csv"
+            config = PipelineConfig(
+                input_path=input_path,
+                output_path=output_path,
+                audit_path=tmp_path / f"audit_{chunk_size}.jsonl",
+                chunk_size=chunk_size,
+            )
+            results[chunk_size] = run_pipeline(config)
+            output_df = pd.read_csv(output_path)
+            assert output_df["value_squared"].tolist() == [100, 400, 1600, 2500, 4900]
+            assert output_df["processed_at"].nunique() == 1
+        
+        assert results[2].success
+        assert results[2].output_records == results[None].output_records == 5
+        assert results[2].errors == results[None].errors == ["Removed 2 rows with null IDs"]
+
+    def test_run_pipeline_chunked_column_types(self, tmp_path: Path):
+        """Test chunks are written with the whole-file column types."""
+        input_path = tmp_path / "input.csv"
+        input_path.write_text("id,value\n1,1\n2,1\n3,1\n4,\n5,1\n6,1\n7,1\n")
+        
+        outputs = {}
+        for chunk_size in (None, 3):
+            output_path = tmp_path / f"output_{chunk_size}.csv"
+            result = run_pipeline(PipelineConfig(
+                input_path=input_path,
+                output_path=output_path,
+                audit_path=tmp_path / f"audit_{chunk_size}.jsonl",
+                transformations=["validate"],
+                chunk_size=chunk_size,
+            ))
+            assert result.success
+            outputs[chunk_size] = output_path.read_bytes()
+        
+        assert outputs[3] == outputs[None]
+        assert b"1,1.0\n" in outputs[3]
+
+    def test_run_pipeline_failure_is_audited(self, tmp_path: Path):
+        """Test a failing run audits completed steps and leaves no output."""
+        input_path = tmp_path / "input.csv"
+        input_path.write_text("id,value\n1,10\n2,20\n3,x\n")
+        
+        for chunk_size in (None, 2):
+            output_path = tmp_path / f"output_{chunk_size}.csv"
+            audit_path = tmp_path / f"audit_{chunk_size}.jsonl"
+            result = run_pipeline(PipelineConfig(
+                input_path=input_path,
+                output_path=output_path,
+                audit_path=audit_path,
+                chunk_size=chunk_size,
+            ))
+            
+            assert not result.success
+            assert not output_path.exists()
+            assert not output_path.with_name(output_path.name + ".partial").exists()
+            
+            entries = AuditLogger(audit_path).read_all()
+            actions = [e.action.value for e in entries]
+            assert actions[:3] == ["pipeline_start", "data_read", "data_transform"]
+            assert actions[-1] == "pipeline_failed"
+            assert "data_write" not in actions
+
+    def test_write_csv_matches_to_csv(self, tmp_path: Path):
+        """Test the CSV writer output is byte-identical to DataFrame.to_csv."""
+        df = pd.DataFrame({
+            "id": [1, 2, 3, 4, 5, 6],
+            "value": [0.1, -0.0, float("nan"), float("inf"), 1e16, 5e-324],
+            "ratio": [1 / 3, 2.5, 1e-5, 123456789012345680.0, None, 100.0],
+            "name": ["a", "b,c", None, "d", "e", "f"],
+        })
+        expected = tmp_path / "expected.csv"
+        actual = tmp_path / "actual.csv"
+        df.to_csv(expected, index=False)
+        
+        write_csv(df.iloc[:3], actual)
+        write_csv(df.iloc[3:], actual, append=True)
+        
+        assert actual.read_bytes() == expected.read_bytes()
+
     def test_file_hash(self, tmp_path: Path):
         """Test file hashing."""
         file_path = tmp_path / "test.txt"
@@ -176,3 +267,29 @@ class TestPipeline:
         
         assert hash1 == hash2
         assert len(hash1) == 64  # SHA-256 hex
+
+    def test_file_hash_cached(self, tmp_path: Path):
+        """Test cached hashing follows file changes."""
+        import os
+        
+        file_path = tmp_path / "test.txt"
+        file_path.write_text("hello world")
+        first = compute_file_hash(file_path, cached=True)
+        assert compute_file_hash(file_path, cached=True) == first == compute_file_hash(file_path)
+        
+        file_path.write_text("hello there")
+        stat = file_path.stat()
+        os.utime(file_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+        assert compute_file_hash(file_path, cached=True) == compute_file_hash(file_path) != first
+
+    def test_file_hash_algorithms(self, tmp_path: Path):
+        """Test alternative file hash algorithms are tagged and validated."""
+        file_path = tmp_path / "test.txt"
+        file_path.write_text("hello world")
+        
+        with pytest.raises(ValueError):
+            compute_file_hash(file_path, "md5")
+        
+        blake3 = pytest.importorskip("blake3")
+        digest = compute_file_hash(file_path, "blake3")
+        assert digest == "blake3:" + blake3.blake3(b"hello world").hexdigest()
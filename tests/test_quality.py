@@ -2,6 +2,7 @@
 
 from datetime import datetime
 
+import pandas as pd
 import pytest
 
 from pipeline.quality import (
@@ -117,6 +118,12 @@ class TestRegexRule:
         assert rule.validate("123456") is False
         assert rule.validate("abcde") is False
 
+    def test_shared_compiled_pattern(self):
+        """Test rules with the same pattern share one compiled regex."""
+        first = RegexRule(name="a", description="A", pattern=r"^[A-Z]{2}$")
+        second = RegexRule(name="b", description="B", pattern=r"^[A-Z]{2}$")
+        assert first._compiled is second._compiled
+
 
 class TestEnumRule:
     """Tests for EnumRule."""
@@ -148,6 +155,16 @@ class TestEnumRule:
         assert rule.validate("male") is True
         assert rule.validate("FEMALE") is True
 
+    def test_unhashable_values(self):
+        """Test membership still works for unhashable allowed values."""
+        rule = EnumRule(
+            name="test", description="Test rule",
+            allowed_values=[["a", "b"], "c"],
+        )
+        assert rule.validate(["a", "b"]) is True
+        assert rule.validate("c") is True
+        assert rule.validate(["c"]) is False
+
 
 class TestUniqueRule:
     """Tests for UniqueRule."""
@@ -241,6 +258,40 @@ class TestDataQualityValidator:
         assert len(issues) == 1
         assert issues[0].field == "name"
 
+    def test_rule_added_after_validation(self):
+        """Test rules added after a validation run are applied."""
+        validator = DataQualityValidator("test")
+        validator.add_field_rule("code", NotNullRule(
+            name="code_required", description="Code required"
+        ))
+        assert validator.validate_record({"code": "abc"}) == []
+        
+        validator.add_field_rule("code", RegexRule(
+            name="code_format", description="Code format", pattern=r"^\d+$",
+        ))
+        issues = validator.validate_record({"code": "abc"})
+        assert [i.rule_name for i in issues] == ["code_format"]
+        assert issues[0].message == "Code format: code_format failed"
+
+    def test_rules_changed_directly(self):
+        """Test edits made through field_rules reach validate_record."""
+        validator = DataQualityValidator("test")
+        rule = NotNullRule(name="a_required", description="A required")
+        validator.add_field_rule("a", rule)
+        assert len(validator.validate_record({})) == 1
+        
+        validator.field_rules["b"] = [NotNullRule(name="b_required", description="B required")]
+        rule.description = "A is mandatory"
+        
+        record_issues = validator.validate_record({})
+        batch_issues = validator.validate_batch([{}]).issues
+        
+        assert [i.message for i in record_issues] == [
+            "A is mandatory: a_required failed",
+            "B required: b_required failed",
+        ]
+        assert [i.message for i in batch_issues] == [i.message for i in record_issues]
+
     def test_validate_batch(self):
         """Test batch validation."""
         validator = DataQualityValidator("test")
@@ -359,6 +410,122 @@ class TestDataQualityValidator:
         })
         assert len(issues) == 1
 
+    def test_max_issues_per_rule(self):
+        """Test issue sampling keeps counts and scores exact."""
+        validator = DataQualityValidator("test")
+        validator.add_field_rule("code", RegexRule(
+            name="code_format", description="Code format", pattern=r"^\d+$",
+        ))
+        validator.add_field_rule("code", UniqueRule(
+            name="code_unique", description="Code unique", severity=Severity.WARNING,
+        ))
+        records = [{"code": "x"} for _ in range(10)]
+        
+        full = validator.validate_batch(records)
+        sampled = validator.validate_batch(records, max_issues_per_rule=2)
+        framed = validator.validate_dataframe(pd.DataFrame(records), max_issues_per_rule=2)
+        
+        for report in (sampled, framed):
+            assert len(report.issues) == 4
+            assert report.suppressed_issues == {"error": 8, "warning": 7}
+            assert report.error_count == full.error_count == 10
+            assert report.warning_count == full.warning_count == 9
+            assert report.invalid_records == full.invalid_records
+            assert report.dimension_scores == full.dimension_scores
+            assert report.field_reports["code"].invalid_count == 10
+            assert len(report.field_reports["code"].issues) == 4
+
+    def test_validate_dataframe_matches_batch(self):
+        """Test column-wise validation reports the same as validate_batch."""
+        validator = create_encounter_validator()
+        validator.add_field_rule("los_days", RangeRule(
+            name="los_range", description="Length of stay", min_value=0, max_value=365,
+        ))
+        validator.add_field_rule("admitted", DateRangeRule(
+            name="admitted_range", description="Admission date",
+            min_date=datetime(2020, 1, 1), max_date=datetime(2025, 1, 1),
+        ))
+        validator.add_field_rule("payer", CustomRule(
+            name="payer_known", description="Payer known",
+            validator=lambda v, c: v is None or v.startswith("P"),
+        ))
+        
+        records = [
+            {"encounter_id": "E1", "patient_id": "P1", "encounter_type": "Inpatient",
+             "status": "finished", "los_days": 3, "admitted": datetime(2024, 1, 1),
+             "payer": "P01", "actual_start": "2024-01-01T10:00:00",
+             "actual_end": "2024-01-02T10:00:00"},
+            {"encounter_id": "E1", "patient_id": None, "encounter_type": " ",
+             "status": "lost", "los_days": 400, "admitted": datetime(2019, 1, 1),
+             "payer": "X", "actual_start": "2024-01-02T10:00:00",
+             "actual_end": "2024-01-01T10:00:00"},
+            {"encounter_id": None, "patient_id": "P3", "encounter_type": "telehealth",
+             "status": None, "los_days": None, "admitted": None,
+             "payer": None, "actual_start": None, "actual_end": None},
+        ]
+        
+        expected = validator.validate_batch(records)
+        report = validator.validate_dataframe(pd.DataFrame(records))
+        
+        exclude = {"validated_at", "duration_ms"}
+        assert report.model_dump(exclude=exclude) == expected.model_dump(exclude=exclude)
+        assert report.invalid_records == 2
+
+    def test_validate_dataframe_numeric_strings(self):
+        """Test range checks on text columns follow float() parsing."""
+        validator = DataQualityValidator("test")
+        validator.add_field_rule("value", RangeRule(
+            name="value_range", description="Value range", min_value=0, max_value=100,
+        ))
+        df = pd.DataFrame({"value": ["50", " 7 ", "1_000", "abc", None]})
+        
+        report = validator.validate_dataframe(df)
+        
+        assert [i.row_index for i in report.issues] == [2, 3]
+        assert report.field_reports["value"].null_count == 1
+
+    def test_validate_dataframe_frame_rule(self):
+        """Test a row rule's column-wise form replaces per-row calls."""
+        calls = []
+        
+        def row_rule(record):
+            calls.append(record)
+            return []
+        
+        def frame_rule(df):
+            return None if "fallback" in df.columns else []
+        
+        validator = DataQualityValidator("test")
+        validator.add_row_rule(row_rule, frame_rule)
+        
+        validator.validate_dataframe(pd.DataFrame({"a": [1, 2]}))
+        assert calls == []
+        validator.validate_dataframe(pd.DataFrame({"fallback": [1, 2]}))
+        assert len(calls) == 2
+
+    def test_validate_dataframe_missing_values(self):
+        """Test NaN cells and absent columns are treated as null."""
+        validator = DataQualityValidator("test")
+        validator.add_field_rule("value", NotNullRule(
+            name="value_required", description="Value required"
+        ))
+        validator.add_field_rule("value", RangeRule(
+            name="value_range", description="Value range", min_value=0, max_value=100,
+        ))
+        validator.add_field_rule("absent", NotNullRule(
+            name="absent_required", description="Absent required",
+            severity=Severity.WARNING,
+        ))
+        
+        report = validator.validate_dataframe(pd.DataFrame({"value": [50.0, float("nan"), 150.0]}))
+        
+        field_report = report.field_reports["value"]
+        assert field_report.null_count == 1
+        assert field_report.invalid_count == 1
+        assert report.field_reports["absent"].null_count == 3
+        assert report.invalid_records == 2
+        assert [i.row_index for i in report.issues if i.field == "value"] == [1, 2]
+
 
 # =============================================================================
 # HEALTHCARE VALIDATOR FACTORY TESTS